@@ -0,0 +1,282 @@
+import asyncio
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from database_manager import (
+    DEFAULT_BACKUP_PAGES,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_PROFILE,
+    DEFAULT_SEARCH_LIMIT,
+    BackupProgress,
+    BulkResult,
+    DatabaseManager,
+)
+from migrations import DEFAULT_BATCH_SIZE, MigrationProgress
+
+
+T = TypeVar("T")
+
+# Upper bound on the number of small writes committed together
+DEFAULT_MAX_GROUP_SIZE: int = 1_000
+
+
+class AsyncDatabaseManager:
+    """
+    Asyncio facade for DatabaseManager. Every call runs on one dedicated thread that owns
+    the connection, so the event loop never blocks on SQLite. Small writes issued
+    concurrently are committed together in a single transaction (group commit).
+    Open it with "async with AsyncDatabaseManager(...)" or "await AsyncDatabaseManager.open(...)".
+    """
+
+    def __init__(
+        self,
+        db_name: str,
+        profile: str = DEFAULT_PROFILE,
+        max_group_size: int = DEFAULT_MAX_GROUP_SIZE,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+        instrument: bool = False,
+        slow_query_ms: Optional[float] = None,
+    ) -> None:
+        """
+        Start opening the database on the database thread without waiting for it; opening
+        runs pending migrations, which can take a while on large files. The cache and
+        instrumentation options are passed to DatabaseManager.
+        """
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="database")
+        # The connection must be created on the thread that will use it
+        self._opening: "Future[DatabaseManager]" = self._executor.submit(
+            DatabaseManager,
+            db_name,
+            profile,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            instrument=instrument,
+            slow_query_ms=slow_query_ms,
+        )
+        self.max_group_size: int = max_group_size
+        self.group_commits: int = 0
+        self._pending: List[Tuple[Callable[[], object], "asyncio.Future[object]"]] = []
+        self._flush_task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    async def open(cls, db_name: str, *args: object, **kwargs: object) -> "AsyncDatabaseManager":
+        """Create a manager and wait, without blocking the event loop, until the database is open."""
+        manager: AsyncDatabaseManager = cls(db_name, *args, **kwargs)
+        await manager._wait_until_open()
+        return manager
+
+    async def _wait_until_open(self) -> None:
+        try:
+            await asyncio.wrap_future(self._opening)
+        except BaseException:
+            self._executor.shutdown(wait=False)
+            raise
+
+    @property
+    def _db(self) -> DatabaseManager:
+        if not self._opening.done():
+            raise RuntimeError(
+                "The database is still opening; use 'async with' or 'await AsyncDatabaseManager.open(...)'"
+            )
+        return self._opening.result()
+
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        await self._wait_until_open()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def _run(self, function: Callable[..., T], *args: object, **kwargs: object) -> T:
+        """Run a DatabaseManager call on the database thread."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    async def _write(self, function: Callable[..., None], *args: object) -> None:
+        """Queue a small write for the next group commit and wait until it is committed."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        future: "asyncio.Future[object]" = loop.create_future()
+        self._pending.append((functools.partial(function, *args), future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush())
+        await future
+
+    async def _flush(self) -> None:
+        """Commit queued writes group by group until the queue is empty."""
+        try:
+            while self._pending:
+                group = self._pending[: self.max_group_size]
+                del self._pending[: self.max_group_size]
+                try:
+                    results: List[Tuple[bool, object]] = await self._run(
+                        self._commit_group, [call for call, _ in group]
+                    )
+                except Exception as error:
+                    # The commit itself failed, so none of the writes persisted
+                    results = [(False, error)] * len(group)
+                for (_, future), (succeeded, value) in zip(group, results):
+                    if future.cancelled():
+                        continue
+                    if succeeded:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+        finally:
+            self._flush_task = None
+
+    def _commit_group(self, calls: List[Callable[[], object]]) -> List[Tuple[bool, object]]:
+        """
+        Run calls in one transaction on the database thread. Each call gets its own
+        savepoint, so a failing write is rolled back without affecting the others.
+        """
+        results: List[Tuple[bool, object]] = []
+        with self._db.session() as session:
+            for call in calls:
+                session.execute("SAVEPOINT group_write")
+                try:
+                    value: object = call()
+                except Exception as error:
+                    session.execute("ROLLBACK TO group_write")
+                    results.append((False, error))
+                else:
+                    results.append((True, value))
+                session.execute("RELEASE group_write")
+        self.group_commits += 1
+        return results
+
+    async def create_tables(self) -> None:
+        await self._run(self._db.create_tables)
+
+    async def migrate(
+        self, batch_size: int = DEFAULT_BATCH_SIZE, progress: Optional[MigrationProgress] = None
+    ) -> int:
+        return await self._run(self._db.migrate, batch_size, progress)
+
+    async def apply_profile(self, profile: str) -> None:
+        await self._run(self._db.apply_profile, profile)
+
+    async def insert_employee(self, employee_name: str, department: str, contact_phone: str) -> None:
+        await self._write(self._db.insert_employee, employee_name, department, contact_phone)
+
+    async def insert_document(self, document_designation: str, document_name: str, document_quantity: int) -> None:
+        await self._write(self._db.insert_document, document_designation, document_name, document_quantity)
+
+    async def link_employee_to_document(
+        self, employee_name: str, document_designation: str, document_instance_number: int
+    ) -> None:
+        await self._write(
+            self._db.link_employee_to_document, employee_name, document_designation, document_instance_number
+        )
+
+    async def insert_employees_bulk(
+        self,
+        employees: Iterable[Tuple[str, str, str]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        update_existing: bool = False,
+    ) -> BulkResult:
+        return await self._run(self._db.insert_employees_bulk, employees, chunk_size, update_existing)
+
+    async def insert_documents_bulk(
+        self,
+        documents: Iterable[Tuple[str, str, int]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        update_existing: bool = False,
+    ) -> BulkResult:
+        return await self._run(self._db.insert_documents_bulk, documents, chunk_size, update_existing)
+
+    async def link_bulk(
+        self, links: Iterable[Tuple[str, str, int]], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> BulkResult:
+        return await self._run(self._db.link_bulk, links, chunk_size)
+
+    async def get_all_documents(self) -> List[str]:
+        return await self._run(self._db.get_all_documents)
+
+    async def get_all_employees(self) -> List[str]:
+        return await self._run(self._db.get_all_employees)
+
+    async def get_employees_by_document(self, document_designation: str) -> List[str]:
+        return await self._run(self._db.get_employees_by_document, document_designation)
+
+    async def get_documents_by_employee(self, employee_name: str) -> List[str]:
+        return await self._run(self._db.get_documents_by_employee, employee_name)
+
+    async def get_employees_by_documents(
+        self, document_designations: Iterable[str], records: bool = False
+    ) -> Dict[str, List]:
+        return await self._run(self._db.get_employees_by_documents, list(document_designations), records)
+
+    async def get_documents_by_employees(
+        self, employee_names: Iterable[str], records: bool = False
+    ) -> Dict[str, List]:
+        return await self._run(self._db.get_documents_by_employees, list(employee_names), records)
+
+    async def get_employees_page(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[str]:
+        return await self._run(self._db.get_employees_page, after, limit)
+
+    async def get_documents_page(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[str]:
+        return await self._run(self._db.get_documents_page, after, limit)
+
+    async def search_employees(self, prefix: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[str]:
+        return await self._run(self._db.search_employees, prefix, limit)
+
+    async def search_documents(self, prefix: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[str]:
+        return await self._run(self._db.search_documents, prefix, limit)
+
+    async def backup(
+        self, target_path: str, pages: int = DEFAULT_BACKUP_PAGES, progress: Optional[BackupProgress] = None
+    ) -> None:
+        """Run an online backup on the database thread; progress is called on that thread."""
+        await self._run(self._db.backup, target_path, pages, progress)
+
+    async def explain(self, query: str, parameters: Tuple = ()) -> List[str]:
+        return await self._run(self._db.explain, query, parameters)
+
+    async def settings(self) -> Dict[str, object]:
+        return await self._run(self._db.settings)
+
+    async def stats(self) -> Dict[str, object]:
+        return await self._run(self._db.stats)
+
+    def iter_employees(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Tuple[str, str, str]]:
+        return self._iterate(self._db.iter_employees, chunk_size)
+
+    def iter_documents(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Tuple[str, str, int]]:
+        return self._iterate(self._db.iter_documents, chunk_size)
+
+    def iter_links(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Tuple[str, str, int]]:
+        return self._iterate(self._db.iter_links, chunk_size)
+
+    def iter_employee_documents(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Tuple]:
+        return self._iterate(self._db.iter_employee_documents, chunk_size)
+
+    def iter_query(
+        self, query: str, parameters: Tuple = (), chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[Tuple]:
+        return self._iterate(functools.partial(self._db.iter_query, query, parameters), chunk_size)
+
+    async def _iterate(self, open_rows: Callable[[int], Iterator[Tuple]], chunk_size: int) -> AsyncIterator[Tuple]:
+        """Stream rows from a DatabaseManager iterator, fetching one chunk per executor call."""
+        rows: Iterator[Tuple] = await self._run(open_rows, chunk_size)
+        try:
+            while True:
+                chunk: List[Tuple] = await self._run(lambda: list(islice(rows, chunk_size)))
+                if not chunk:
+                    return
+                for row in chunk:
+                    yield row
+        finally:
+            # The cursor belongs to the database thread, so it must be closed there
+            await self._run(rows.close)
+
+    async def close(self) -> None:
+        """Commit pending writes, close the connection and stop the database thread."""
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._wait_until_open()
+        await self._run(self._db.close)
+        self._executor.shutdown(wait=True)
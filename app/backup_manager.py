@@ -0,0 +1,183 @@
+import datetime
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
+from concurrent.futures import Future
+from typing import BinaryIO, Dict, List, Optional
+
+from database_manager import DEFAULT_BACKUP_PAGES, BackupProgress, DatabaseManager
+
+
+FULL_SUFFIX: str = ".full.gz"
+DELTA_SUFFIX: str = ".delta.gz"
+
+# Page number prefix of every page record in a delta snapshot
+PAGE_NUMBER: struct.Struct = struct.Struct(">I")
+
+
+def integrity_check(path: str) -> List[str]:
+    """Run PRAGMA integrity_check on a database file; a healthy file returns ["ok"]."""
+    connection: sqlite3.Connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return [row[0] for row in connection.execute("PRAGMA integrity_check")]
+    finally:
+        connection.close()
+
+
+def _read_page_size(path: str) -> int:
+    connection: sqlite3.Connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return connection.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        connection.close()
+
+
+class SnapshotManager:
+    """
+    Gzip-compressed snapshots of a database kept in one directory.
+    A full snapshot stores the whole file; an incremental snapshot stores only the pages
+    that differ from the latest full snapshot, so restoring needs at most two files.
+    Only the newest `retention` full snapshots (and the increments based on them) are kept.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        directory: str,
+        retention: int = 7,
+        pages: int = DEFAULT_BACKUP_PAGES,
+        compresslevel: int = 6,
+    ) -> None:
+        if retention < 1:
+            raise ValueError("retention must be a positive integer")
+        self.db: DatabaseManager = db
+        self.directory: str = directory
+        self.retention: int = retention
+        self.pages: int = pages
+        self.compresslevel: int = compresslevel
+        os.makedirs(directory, exist_ok=True)
+
+    def list_snapshots(self) -> List[str]:
+        """Return snapshot file names, oldest first."""
+        names: List[str] = [
+            name for name in os.listdir(self.directory) if name.endswith((FULL_SUFFIX, DELTA_SUFFIX))
+        ]
+        return sorted(names)
+
+    def create_snapshot(self, incremental: bool = False, progress: Optional[BackupProgress] = None) -> str:
+        """
+        Take an online backup and store it as a snapshot; returns the snapshot file name.
+        An incremental snapshot falls back to a full one if there is no usable base.
+        """
+        stamp: str = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        with tempfile.TemporaryDirectory(dir=self.directory) as work_directory:
+            copy_path: str = os.path.join(work_directory, "snapshot.db")
+            self.db.backup(copy_path, self.pages, progress)
+
+            base: Optional[str] = self._latest_full() if incremental else None
+            if base is not None and self._write_delta(copy_path, base, stamp + DELTA_SUFFIX):
+                name: str = stamp + DELTA_SUFFIX
+            else:
+                name = stamp + FULL_SUFFIX
+                with open(copy_path, "rb") as source, self._open_output(name) as target:
+                    shutil.copyfileobj(source, target)
+        self.prune()
+        return name
+
+    def create_snapshot_in_background(
+        self, incremental: bool = False, progress: Optional[BackupProgress] = None
+    ) -> "Future[str]":
+        """Run create_snapshot() on a separate thread; the future resolves to the snapshot name."""
+        future: "Future[str]" = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self.create_snapshot(incremental, progress))
+            except BaseException as error:
+                future.set_exception(error)
+
+        threading.Thread(target=run, name="database-snapshot").start()
+        return future
+
+    def restore(self, name: str, target_path: str) -> None:
+        """Rebuild the database file captured by a snapshot at target_path."""
+        if name.endswith(FULL_SUFFIX):
+            with gzip.open(os.path.join(self.directory, name), "rb") as source, open(target_path, "wb") as target:
+                shutil.copyfileobj(source, target)
+            return
+
+        with gzip.open(os.path.join(self.directory, name), "rb") as delta:
+            header: Dict[str, object] = json.loads(delta.readline())
+            self.restore(str(header["base"]), target_path)
+            page_size: int = int(header["page_size"])
+            with open(target_path, "r+b") as target:
+                while True:
+                    number: bytes = delta.read(PAGE_NUMBER.size)
+                    if not number:
+                        break
+                    target.seek(PAGE_NUMBER.unpack(number)[0] * page_size)
+                    target.write(delta.read(page_size))
+                target.truncate(int(header["page_count"]) * page_size)
+
+    def verify(self, name: str) -> List[str]:
+        """Restore a snapshot to a temporary file and return its PRAGMA integrity_check result."""
+        with tempfile.TemporaryDirectory() as work_directory:
+            path: str = os.path.join(work_directory, "verify.db")
+            self.restore(name, path)
+            return integrity_check(path)
+
+    def prune(self) -> List[str]:
+        """Delete snapshots beyond the retention limit; returns the deleted file names."""
+        names: List[str] = self.list_snapshots()
+        full: List[str] = [name for name in names if name.endswith(FULL_SUFFIX)]
+        kept: List[str] = full[-self.retention:]
+        deleted: List[str] = [name for name in full if name not in kept]
+        for name in names:
+            if name.endswith(DELTA_SUFFIX) and self._delta_base(name) not in kept:
+                deleted.append(name)
+        for name in deleted:
+            os.remove(os.path.join(self.directory, name))
+        return deleted
+
+    def _latest_full(self) -> Optional[str]:
+        full: List[str] = [name for name in self.list_snapshots() if name.endswith(FULL_SUFFIX)]
+        return full[-1] if full else None
+
+    def _delta_base(self, name: str) -> str:
+        with gzip.open(os.path.join(self.directory, name), "rb") as delta:
+            return str(json.loads(delta.readline())["base"])
+
+    def _open_output(self, name: str) -> BinaryIO:
+        return gzip.open(os.path.join(self.directory, name), "wb", compresslevel=self.compresslevel)
+
+    def _write_delta(self, copy_path: str, base: str, name: str) -> bool:
+        """
+        Write the pages of copy_path that differ from the base snapshot.
+        Returns False (writing nothing) if the page size changed since the base was taken.
+        """
+        page_size: int = _read_page_size(copy_path)
+        with gzip.open(os.path.join(self.directory, base), "rb") as base_file:
+            base_header: bytes = base_file.read(100)
+        if len(base_header) < 100:
+            return False
+        # The page size is stored big-endian at offset 16; the value 1 means 65536
+        base_page_size: int = struct.unpack(">H", base_header[16:18])[0]
+        if (65536 if base_page_size == 1 else base_page_size) != page_size:
+            return False
+
+        page_count: int = os.path.getsize(copy_path) // page_size
+        with open(copy_path, "rb") as current, gzip.open(
+            os.path.join(self.directory, base), "rb"
+        ) as previous, self._open_output(name) as delta:
+            header: Dict[str, object] = {"base": base, "page_size": page_size, "page_count": page_count}
+            delta.write(json.dumps(header).encode("utf-8") + b"\n")
+            for number in range(page_count):
+                page: bytes = current.read(page_size)
+                if previous.read(page_size) != page:
+                    delta.write(PAGE_NUMBER.pack(number) + page)
+        return True
@@ -0,0 +1,528 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from itertools import count as counter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from database_manager import DOCUMENTS_BY_EMPLOYEE_QUERY, DatabaseManager
+from test_data_generator import (
+    document_designation,
+    employee_name,
+    generate_documents,
+    generate_employees,
+    generate_links,
+    generate_test_data,
+)
+
+
+DEFAULT_SCALES: Tuple[int, ...] = (1_000, 100_000, 1_000_000)
+APP_DIRECTORY: str = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE: str = os.path.join(APP_DIRECTORY, "benchmark_baseline.json")
+# interface_manager.py quits on the first paint of its window when started with this argument
+FIRST_PAINT_FLAG: str = "--exit-after-first-paint"
+# Startup timings are stored next to the scales in the results
+STARTUP: str = "startup"
+
+# Runs merged into a new baseline by --update-baseline
+DEFAULT_BASELINE_RUNS: int = 3
+
+# Measurement: {"median_ms", "min_ms", "p25_ms", "p75_ms", "repeats"}
+Measurement = Dict[str, float]
+# Results: scale (or STARTUP) -> operation -> Measurement
+Results = Dict[str, Dict[str, Measurement]]
+
+
+def employee_rows(count: int) -> Iterator[Tuple[str, str, str]]:
+    """Yield count synthetic employee rows."""
+    return generate_employees(count)
+
+
+def time_on_fresh_database(operation: Callable[[DatabaseManager], None]) -> float:
+    """Run operation against a new on-disk database and return elapsed seconds."""
+    with tempfile.TemporaryDirectory() as directory:
+        db: DatabaseManager = DatabaseManager(os.path.join(directory, "benchmark.db"))
+        db.create_tables()
+        start: float = time.perf_counter()
+        operation(db)
+        elapsed: float = time.perf_counter() - start
+        db.close()
+    return elapsed
+
+
+def insert_one_by_one(db: DatabaseManager, count: int) -> None:
+    for name, department, contact_phone in employee_rows(count):
+        db.insert_employee(name, department, contact_phone)
+
+
+def benchmark_bulk_insert(count: int) -> None:
+    """Compare per-row insert_employee against insert_employees_bulk."""
+    single: float = time_on_fresh_database(lambda db: insert_one_by_one(db, count))
+    bulk: float = time_on_fresh_database(lambda db: db.insert_employees_bulk(employee_rows(count)))
+    print(f"insert_employee        {count} rows: {single:8.2f} s ({count / single:10.0f} rows/s)")
+    print(f"insert_employees_bulk  {count} rows: {bulk:8.2f} s ({count / bulk:10.0f} rows/s)")
+
+
+def benchmark_concurrency(threads: int, operations: int, pool_size: int, write_ratio: float) -> None:
+    """
+    Run threads workers against one pooled manager, each performing operations calls
+    that are link updates with probability write_ratio and lookups otherwise.
+    """
+    employee_count: int = 10_000
+    document_count: int = 1_000
+    with tempfile.TemporaryDirectory() as directory:
+        db: DatabaseManager = DatabaseManager(os.path.join(directory, "benchmark.db"), pool_size=pool_size)
+        db.create_tables()
+        db.insert_employees_bulk(generate_employees(employee_count))
+        db.insert_documents_bulk(generate_documents(document_count))
+
+        def worker(seed: int) -> None:
+            generator: random.Random = random.Random(seed)
+            for _ in range(operations):
+                employee: str = employee_name(generator.randint(1, employee_count))
+                document: str = document_designation(generator.randint(1, document_count))
+                if generator.random() < write_ratio:
+                    db.link_employee_to_document(employee, document, generator.randrange(100))
+                elif generator.random() < 0.5:
+                    db.get_documents_by_employee(employee)
+                else:
+                    db.get_employees_by_document(document)
+
+        workers: List[threading.Thread] = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+        start: float = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed: float = time.perf_counter() - start
+        db.close()
+
+    total: int = threads * operations
+    print(
+        f"{threads} threads, pool_size={pool_size}, {write_ratio:.0%} writes: "
+        f"{total} operations in {elapsed:.2f} s ({total / elapsed:.0f} ops/s)"
+    )
+
+
+def benchmark_search(count: int, queries: int) -> None:
+    """Measure search_employees latency for random prefixes on count employees."""
+    with tempfile.TemporaryDirectory() as directory:
+        db: DatabaseManager = DatabaseManager(os.path.join(directory, "benchmark.db"), profile="bulk")
+        db.create_tables()
+        db.insert_employees_bulk(employee_rows(count))
+        generator: random.Random = random.Random(0)
+        prefixes: List[str] = ["Em", "Fin", "Employee 1", "900"] + [
+            str(generator.randrange(count))[: generator.randint(1, 4)] for _ in range(queries)
+        ]
+        latencies: List[float] = []
+        for prefix in prefixes:
+            start: float = time.perf_counter()
+            db.search_employees(prefix)
+            latencies.append(time.perf_counter() - start)
+        db.close()
+
+    latencies.sort()
+    print(
+        f"search_employees on {count} rows: p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms"
+    )
+
+
+# Name-keyed schema used before the integer surrogate keys, for the schema comparison
+LEGACY_SCHEMA: str = """
+    CREATE TABLE Employees (employee_name TEXT PRIMARY KEY NOT NULL, department TEXT NOT NULL,
+                            contact_phone TEXT NOT NULL);
+    CREATE TABLE Documents (document_designation TEXT PRIMARY KEY NOT NULL, document_name TEXT NOT NULL,
+                            document_quantity INTEGER NOT NULL);
+    CREATE TABLE Employees_Documents (employee_name TEXT NOT NULL, document_designation TEXT NOT NULL,
+                                      document_instance_number INTEGER NOT NULL,
+                                      PRIMARY KEY (employee_name, document_designation));
+    CREATE INDEX idx_employees_documents_document ON Employees_Documents (document_designation, employee_name);
+"""
+LEGACY_LOOKUP_QUERY: str = "SELECT document_designation FROM Employees_Documents WHERE employee_name = ?"
+
+
+def link_storage_bytes(connection: sqlite3.Connection) -> int:
+    """Bytes used by Employees_Documents and its indexes, as reported by the dbstat table."""
+    query: str = """
+        SELECT SUM(pgsize) FROM dbstat
+        WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name = 'Employees_Documents')
+    """
+    return connection.execute(query).fetchone()[0]
+
+
+def benchmark_schema(count: int, queries: int) -> None:
+    """Compare file size and lookup latency of the name-keyed and the integer-keyed schema."""
+    document_count: int = max(count // 10, 10)
+    generator: random.Random = random.Random(0)
+    employees: List[str] = [employee_name(generator.randint(1, count)) for _ in range(queries)]
+
+    def lookup_ms(lookup: Callable[[str], object]) -> float:
+        start: float = time.perf_counter()
+        for name in employees:
+            lookup(name)
+        return (time.perf_counter() - start) * 1000 / queries
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path: str = os.path.join(directory, "benchmark.db")
+        connection: sqlite3.Connection = sqlite3.connect(db_path)
+        connection.executescript(LEGACY_SCHEMA)
+        connection.executemany("INSERT INTO Employees VALUES (?, ?, ?)", generate_employees(count))
+        connection.executemany("INSERT INTO Documents VALUES (?, ?, ?)", generate_documents(document_count))
+        connection.executemany(
+            "INSERT INTO Employees_Documents VALUES (?, ?, ?)", generate_links(count, document_count)
+        )
+        connection.commit()
+        connection.execute("VACUUM")
+        legacy_size: int = os.path.getsize(db_path)
+        legacy_links: int = link_storage_bytes(connection)
+        legacy_ms: float = lookup_ms(lambda name: connection.execute(LEGACY_LOOKUP_QUERY, (name,)).fetchall())
+        connection.close()
+
+        start: float = time.perf_counter()
+        db: DatabaseManager = DatabaseManager(db_path)
+        conversion: float = time.perf_counter() - start
+        db.connection.execute("VACUUM")
+        size: int = os.path.getsize(db_path)
+        links: int = link_storage_bytes(db.connection)
+        current_ms: float = lookup_ms(
+            lambda name: db.connection.execute(DOCUMENTS_BY_EMPLOYEE_QUERY, (name,)).fetchall()
+        )
+        db.close()
+
+    print(f"conversion of {count} employees: {conversion:.2f} s")
+    print(
+        f"name keys:    file {legacy_size / 2**20:6.1f} MiB, links {legacy_links / 2**20:6.1f} MiB, "
+        f"documents by employee {legacy_ms:.3f} ms"
+    )
+    print(
+        f"integer keys: file {size / 2**20:6.1f} MiB, links {links / 2**20:6.1f} MiB, "
+        f"documents by employee {current_ms:.3f} ms"
+    )
+
+
+def summarize(durations_ms: Sequence[float]) -> Measurement:
+    """Median, minimum and quartiles of durations in milliseconds."""
+    quartiles: List[float] = (
+        statistics.quantiles(durations_ms, n=4) if len(durations_ms) > 1 else [durations_ms[0]] * 3
+    )
+    return {
+        "median_ms": statistics.median(durations_ms),
+        "min_ms": min(durations_ms),
+        "p25_ms": quartiles[0],
+        "p75_ms": quartiles[2],
+        "repeats": len(durations_ms),
+    }
+
+
+def measure(operation: Callable[[], object], repeats: int) -> Measurement:
+    """Call operation repeats times and summarize the durations."""
+    durations_ms: List[float] = []
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        operation()
+        durations_ms.append((time.perf_counter() - start) * 1000)
+    return summarize(durations_ms)
+
+
+def merge_measurements(measurements: Sequence[Measurement]) -> Measurement:
+    """
+    Combine measurements of one operation from several runs: the median of the medians
+    and the widest spread, so that the variation between runs is part of the baseline.
+    """
+    return {
+        "median_ms": statistics.median(measurement["median_ms"] for measurement in measurements),
+        "min_ms": min(measurement["min_ms"] for measurement in measurements),
+        "p25_ms": min(measurement["p25_ms"] for measurement in measurements),
+        "p75_ms": max(measurement["p75_ms"] for measurement in measurements),
+        "repeats": sum(measurement["repeats"] for measurement in measurements),
+    }
+
+
+def merge_results(runs: Sequence[Results]) -> Results:
+    """Merge the results of several suite runs operation by operation."""
+    merged: Results = {}
+    for scale in runs[0]:
+        merged[scale] = {
+            name: merge_measurements([run[scale][name] for run in runs if name in run.get(scale, {})])
+            for name in runs[0][scale]
+        }
+    return merged
+
+
+def benchmark_scale(
+    scale: int, repeats: int, seed: int = 0, only: Optional[Sequence[str]] = None
+) -> Dict[str, Measurement]:
+    """
+    Time every DatabaseManager method (or only the named ones) on a database with scale
+    employees, scale / 10 documents and about 3 Zipf-distributed links per employee.
+    """
+    document_count: int = max(scale // 10, 10)
+    # Full-table operations are slow at large scales, so they are repeated less often
+    scan_repeats: int = max(1, min(repeats, 3))
+    generator: random.Random = random.Random(seed)
+    new_ids: Iterator[int] = counter(1)
+
+    def random_employee() -> str:
+        return employee_name(generator.randint(1, scale))
+
+    def random_document() -> str:
+        return document_designation(generator.randint(1, document_count))
+
+    results: Dict[str, Measurement] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        db: DatabaseManager = DatabaseManager(os.path.join(directory, "benchmark.db"))
+        db.create_tables()
+        start: float = time.perf_counter()
+        generate_test_data(db, employee_count=scale, document_count=document_count, seed=seed)
+        if only is None or "generate_test_data" in only:
+            results["generate_test_data"] = summarize([(time.perf_counter() - start) * 1000])
+
+        operations: Dict[str, Tuple[Callable[[], object], int]] = {
+            "insert_employee": (
+                lambda: db.insert_employee(f"New Employee {next(new_ids)}", "IT", "+7 (900) 000-00-00"),
+                repeats,
+            ),
+            "insert_document": (lambda: db.insert_document(f"NEW-{next(new_ids)}", "New document", 1), repeats),
+            "link_employee_to_document": (
+                lambda: db.link_employee_to_document(random_employee(), random_document(), generator.randrange(100)),
+                repeats,
+            ),
+            "insert_employees_bulk": (
+                lambda: db.insert_employees_bulk(
+                    (f"Bulk Employee {next(new_ids)}", "IT", "+7 (900) 000-00-00") for _ in range(1_000)
+                ),
+                scan_repeats,
+            ),
+            "insert_documents_bulk": (
+                lambda: db.insert_documents_bulk((f"BULK-{next(new_ids)}", "Bulk", 1) for _ in range(1_000)),
+                scan_repeats,
+            ),
+            "link_bulk": (
+                lambda: db.link_bulk((random_employee(), random_document(), 1) for _ in range(1_000)),
+                scan_repeats,
+            ),
+            "get_all_employees": (db.get_all_employees, scan_repeats),
+            "get_all_documents": (db.get_all_documents, scan_repeats),
+            "get_employees_by_document": (lambda: db.get_employees_by_document(random_document()), repeats),
+            "get_documents_by_employee": (lambda: db.get_documents_by_employee(random_employee()), repeats),
+            "get_employees_by_documents": (
+                lambda: db.get_employees_by_documents([random_document() for _ in range(100)]),
+                repeats,
+            ),
+            "get_documents_by_employees": (
+                lambda: db.get_documents_by_employees([random_employee() for _ in range(100)]),
+                repeats,
+            ),
+            "get_employees_page": (lambda: db.get_employees_page(random_employee()), repeats),
+            "get_documents_page": (lambda: db.get_documents_page(random_document()), repeats),
+            "search_employees": (lambda: db.search_employees(random_employee()[:11]), repeats),
+            "search_documents": (lambda: db.search_documents(random_document()[:6]), repeats),
+            "iter_employee_documents": (lambda: deque(db.iter_employee_documents(), maxlen=0), scan_repeats),
+            "backup": (lambda: db.backup(os.path.join(directory, "backup.db")), scan_repeats),
+        }
+        for name, (operation, operation_repeats) in operations.items():
+            if only is None or name in only:
+                results[name] = measure(operation, operation_repeats)
+        db.close()
+    return results
+
+
+def benchmark_startup(repeats: int) -> Dict[str, Measurement]:
+    """
+    Time fresh interpreters: a bare start, importing the data layer and, when PyQt6 is
+    installed, launching the desktop app until its window is first painted.
+    """
+    commands: Dict[str, List[str]] = {
+        "python": [sys.executable, "-c", "pass"],
+        "import_database_manager": [sys.executable, "-c", "import database_manager"],
+    }
+    if importlib.util.find_spec("PyQt6") is not None:
+        commands["first_paint"] = [sys.executable, "interface_manager.py", FIRST_PAINT_FLAG]
+    # Without a display the window is painted offscreen
+    environment: Dict[str, str] = {"QT_QPA_PLATFORM": "offscreen", **os.environ}
+
+    results: Dict[str, Measurement] = {}
+    for name, command in commands.items():
+        results[name] = measure(
+            lambda: subprocess.run(command, cwd=APP_DIRECTORY, env=environment, check=True), repeats
+        )
+    return results
+
+
+def find_regressions(
+    results: Results, baseline: Results, tolerance: float, min_delta_ms: float
+) -> Dict[str, List[str]]:
+    """
+    Compare results with a baseline and return the regressed operations by scale. An operation
+    regresses when even its fastest repeat is more than tolerance (a fraction) and min_delta_ms
+    slower than the upper quartile of the baseline, so ordinary run-to-run noise is not flagged.
+    """
+    regressions: Dict[str, List[str]] = {}
+    for scale, operations in results.items():
+        for name, measurement in operations.items():
+            reference: Optional[Measurement] = baseline.get(scale, {}).get(name)
+            if reference is None:
+                continue
+            current: float = measurement["min_ms"]
+            limit: float = reference["p75_ms"]
+            if current > limit * (1 + tolerance) and current - limit > min_delta_ms:
+                regressions.setdefault(scale, []).append(name)
+    return regressions
+
+
+def remeasure(scale: str, names: Sequence[str], repeats: int) -> Dict[str, Measurement]:
+    """Time the named operations of one scale (or STARTUP) again on a fresh database."""
+    if scale == STARTUP:
+        return benchmark_startup(min(repeats, 10))
+    return benchmark_scale(int(scale), repeats, only=names)
+
+
+def print_results(title: str, results: Dict[str, Measurement]) -> None:
+    print(title, file=sys.stderr)
+    for name, measurement in results.items():
+        print(
+            f"  {name:28} median {measurement['median_ms']:12.3f} ms, min {measurement['min_ms']:12.3f} ms",
+            file=sys.stderr,
+        )
+
+
+def run_once(scales: Sequence[int], repeats: int) -> Results:
+    """Time every operation at every scale and the startup once."""
+    results: Results = {}
+    for scale in scales:
+        results[str(scale)] = benchmark_scale(scale, repeats)
+        print_results(f"Scale {scale}:", results[str(scale)])
+    results[STARTUP] = benchmark_startup(min(repeats, 10))
+    print_results("Startup:", results[STARTUP])
+    return results
+
+
+def run_suite(
+    scales: Sequence[int],
+    repeats: int,
+    output: Optional[str],
+    baseline_path: str,
+    tolerance: float,
+    min_delta_ms: float,
+    update_baseline: bool,
+    baseline_runs: int = DEFAULT_BASELINE_RUNS,
+) -> int:
+    """
+    Run the benchmark suite, record the results and return 1 if anything regressed. A new
+    baseline merges baseline_runs runs; a suspected regression is measured once more and
+    only reported when the second measurement confirms it.
+    """
+    runs: List[Results] = [run_once(scales, repeats) for _ in range(baseline_runs if update_baseline else 1)]
+    results: Results = merge_results(runs)
+
+    report: Dict[str, object] = {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+
+    if update_baseline:
+        baseline: Dict[str, object] = {"results": {}}
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding="utf-8") as stream:
+                baseline = json.load(stream)
+        report["results"] = {**baseline["results"], **results}
+        with open(baseline_path, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+            stream.write("\n")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one.", file=sys.stderr)
+        return 0
+    with open(baseline_path, encoding="utf-8") as stream:
+        reference: Results = json.load(stream)["results"]
+    suspects: Dict[str, List[str]] = find_regressions(results, reference, tolerance, min_delta_ms)
+    confirmed: Results = {}
+    for scale, names in suspects.items():
+        print(f"Measuring {', '.join(names)} at {scale} again", file=sys.stderr)
+        retry: Dict[str, Measurement] = remeasure(scale, names, repeats)
+        confirmed[scale] = {
+            name: merge_measurements([results[scale][name], retry[name]]) for name in names if name in retry
+        }
+    regressions: Dict[str, List[str]] = find_regressions(confirmed, reference, tolerance, min_delta_ms)
+    for scale, names in regressions.items():
+        for name in names:
+            print(
+                f"REGRESSION {name} at {scale}: min {confirmed[scale][name]['min_ms']:.3f} ms "
+                f"vs baseline p75 {reference[scale][name]['p75_ms']:.3f} ms",
+                file=sys.stderr,
+            )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DatabaseManager benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bulk_parser = commands.add_parser("bulk", help="per-row versus bulk inserts")
+    bulk_parser.add_argument("rows", type=int, nargs="?", default=100_000)
+    concurrency_parser = commands.add_parser("concurrency", help="threads mixing lookups and link updates")
+    concurrency_parser.add_argument("--threads", type=int, default=8)
+    concurrency_parser.add_argument("--operations", type=int, default=2_000)
+    concurrency_parser.add_argument("--pool-size", type=int, default=4)
+    concurrency_parser.add_argument("--write-ratio", type=float, default=0.2)
+    search_parser = commands.add_parser("search", help="type-ahead search latency")
+    search_parser.add_argument("rows", type=int, nargs="?", default=1_000_000)
+    search_parser.add_argument("--queries", type=int, default=1_000)
+    schema_parser = commands.add_parser("schema", help="name-keyed versus integer-keyed schema")
+    schema_parser.add_argument("rows", type=int, nargs="?", default=100_000)
+    schema_parser.add_argument("--queries", type=int, default=10_000)
+    startup_parser = commands.add_parser("startup", help="interpreter, data layer import and first window paint")
+    startup_parser.add_argument("--repeats", type=int, default=10)
+    suite_parser = commands.add_parser("suite", help="time every method at several scales against a baseline")
+    suite_parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    suite_parser.add_argument("--repeats", type=int, default=50)
+    suite_parser.add_argument("--output", help="write the results to this JSON file")
+    suite_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    suite_parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown as a fraction")
+    suite_parser.add_argument("--min-delta-ms", type=float, default=0.2, help="ignore slowdowns below this")
+    suite_parser.add_argument("--update-baseline", action="store_true", help="store the results as the baseline")
+    suite_parser.add_argument(
+        "--baseline-runs", type=int, default=DEFAULT_BASELINE_RUNS, help="runs merged by --update-baseline"
+    )
+    arguments = parser.parse_args()
+
+    if arguments.command == "bulk":
+        benchmark_bulk_insert(arguments.rows)
+    elif arguments.command == "concurrency":
+        benchmark_concurrency(arguments.threads, arguments.operations, arguments.pool_size, arguments.write_ratio)
+    elif arguments.command == "search":
+        benchmark_search(arguments.rows, arguments.queries)
+    elif arguments.command == "schema":
+        benchmark_schema(arguments.rows, arguments.queries)
+    elif arguments.command == "startup":
+        for name, measurement in benchmark_startup(arguments.repeats).items():
+            print(f"{name:28} {measurement['median_ms']:12.3f} ms, min {measurement['min_ms']:12.3f} ms")
+    else:
+        sys.exit(
+            run_suite(
+                arguments.scales,
+                arguments.repeats,
+                arguments.output,
+                arguments.baseline,
+                arguments.tolerance,
+                arguments.min_delta_ms,
+                arguments.update_baseline,
+                arguments.baseline_runs,
+            )
+        )
@@ -0,0 +1,227 @@
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from database_manager import DEFAULT_CHUNK_SIZE, PROFILES, BulkResult, DatabaseManager
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Column layout of every importable/exportable table
+TABLE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "employees": ("employee_name", "department", "contact_phone"),
+    "documents": ("document_designation", "document_name", "document_quantity"),
+    "links": ("employee_name", "document_designation", "document_instance_number"),
+    "employee_documents": (
+        "employee_name",
+        "department",
+        "contact_phone",
+        "document_designation",
+        "document_name",
+        "document_quantity",
+        "document_instance_number",
+    ),
+}
+
+# Columns that must be parsed as integers
+INTEGER_COLUMNS: Tuple[str, ...] = ("document_quantity", "document_instance_number")
+
+IMPORTABLE_TABLES: Tuple[str, ...] = ("employees", "documents", "links")
+
+FORMATS: Tuple[str, ...] = ("csv", "jsonl")
+
+
+def detect_format(path: str) -> str:
+    """Guess the file format from the file extension."""
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot detect the format of {path}; pass --format explicitly.")
+
+
+def read_csv_rows(stream: TextIO) -> Iterator[Dict[str, str]]:
+    """Parse CSV rows with a header line into dictionaries."""
+    yield from csv.DictReader(stream)
+
+
+def read_jsonl_rows(stream: TextIO) -> Iterator[str]:
+    """
+    Yield the non-empty lines of a JSONL file; validate_rows parses them so that
+    malformed lines can be skipped like any other invalid row.
+    """
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def validate_rows(
+    rows: Iterable[Union[Dict[str, object], str]], table: str, skip_invalid: bool = False
+) -> Iterator[Tuple]:
+    """
+    Convert parsed records (or JSON object strings) into row tuples in table column order.
+    Invalid records raise ValueError, or are logged as warnings and dropped when skip_invalid is set.
+    """
+    columns: Tuple[str, ...] = TABLE_COLUMNS[table]
+    for row_number, record in enumerate(rows, start=1):
+        try:
+            if isinstance(record, str):
+                record = json.loads(record)
+            if not isinstance(record, dict):
+                raise ValueError(f"expected an object, got {type(record).__name__}")
+            values: List[object] = []
+            for column in columns:
+                value: object = record.get(column)
+                if value is None or value == "":
+                    raise ValueError(f"missing value for {column}")
+                values.append(int(value) if column in INTEGER_COLUMNS else str(value))
+        except (TypeError, ValueError) as error:
+            if not skip_invalid:
+                raise ValueError(f"Row {row_number}: {error}") from error
+            logger.warning(
+                "Row %d skipped: %s",
+                row_number,
+                error,
+                extra={"event": "invalid_row", "row_number": row_number, "error": str(error)},
+            )
+            continue
+        yield tuple(values)
+
+
+def report_progress(
+    rows: Iterable[Tuple], interval: float = 1.0, output: TextIO = sys.stderr
+) -> Iterator[Tuple]:
+    """Pass rows through unchanged, printing the rows/sec rate every interval seconds."""
+    start: float = time.perf_counter()
+    last_report: float = start
+    count: int = 0
+    for row in rows:
+        count += 1
+        yield row
+        now: float = time.perf_counter()
+        if now - last_report >= interval:
+            print(f"{count} rows, {count / (now - start):.0f} rows/s", file=output)
+            last_report = now
+    elapsed: float = time.perf_counter() - start
+    rate: float = count / elapsed if elapsed > 0 else 0.0
+    print(f"{count} rows in {elapsed:.2f} s, {rate:.0f} rows/s", file=output)
+
+
+def import_file(
+    db: DatabaseManager,
+    path: str,
+    table: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_invalid: bool = False,
+    progress: bool = True,
+) -> BulkResult:
+    """Stream a CSV or JSONL file into one of the importable tables."""
+    if table not in IMPORTABLE_TABLES:
+        raise ValueError(f"Unknown table {table}; expected one of {', '.join(IMPORTABLE_TABLES)}.")
+    file_format = file_format or detect_format(path)
+    writers: Dict[str, Callable[..., BulkResult]] = {
+        "employees": db.insert_employees_bulk,
+        "documents": db.insert_documents_bulk,
+        "links": db.link_bulk,
+    }
+
+    # utf-8-sig drops the byte order mark that Excel and many HR systems put before the header
+    with open(path, newline="", encoding="utf-8-sig") as stream:
+        records: Iterator[Union[Dict[str, object], str]] = (
+            read_csv_rows(stream) if file_format == "csv" else read_jsonl_rows(stream)
+        )
+        rows: Iterator[Tuple] = validate_rows(records, table, skip_invalid)
+        if progress:
+            rows = report_progress(rows)
+        return writers[table](rows, chunk_size=chunk_size)
+
+
+def export_file(
+    db: DatabaseManager,
+    path: str,
+    table: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: bool = True,
+) -> int:
+    """Stream a table (or the joined employee_documents view) into a CSV or JSONL file."""
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"Unknown table {table}; expected one of {', '.join(TABLE_COLUMNS)}.")
+    file_format = file_format or detect_format(path)
+    readers: Dict[str, Callable[[int], Iterator[Tuple]]] = {
+        "employees": db.iter_employees,
+        "documents": db.iter_documents,
+        "links": db.iter_links,
+        "employee_documents": db.iter_employee_documents,
+    }
+    columns: Tuple[str, ...] = TABLE_COLUMNS[table]
+    rows: Iterator[Tuple] = readers[table](chunk_size)
+    if progress:
+        rows = report_progress(rows)
+
+    count: int = 0
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        if file_format == "csv":
+            writer = csv.writer(stream)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                stream.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+                count += 1
+    return count
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import and export employees, documents and links.")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("table", choices=tuple(TABLE_COLUMNS))
+    parser.add_argument("path", help="CSV or JSONL file to read from or write to")
+    parser.add_argument("--db", default="database.db", help="SQLite database file")
+    parser.add_argument("--profile", choices=tuple(PROFILES), default="fast", help="connection tuning profile")
+    parser.add_argument("--format", choices=FORMATS, help="file format (detected from the extension by default)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--skip-invalid", action="store_true", help="drop invalid rows instead of aborting")
+    parser.add_argument("--quiet", action="store_true", help="do not report progress")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arguments: argparse.Namespace = parse_arguments(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    db: DatabaseManager = DatabaseManager(arguments.db, arguments.profile)
+    try:
+        db.create_tables()
+        if arguments.command == "import":
+            result: BulkResult = import_file(
+                db,
+                arguments.path,
+                arguments.table,
+                arguments.format,
+                arguments.chunk_size,
+                arguments.skip_invalid,
+                not arguments.quiet,
+            )
+            print(f"Inserted: {result.inserted}, skipped: {result.skipped}, updated: {result.updated}")
+        else:
+            count: int = export_file(
+                db, arguments.path, arguments.table, arguments.format, arguments.chunk_size, not arguments.quiet
+            )
+            print(f"Exported {count} rows to {arguments.path}")
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,146 +1,1288 @@
+import logging
+import queue
 import sqlite3
-from typing import List, Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from instrumentation import Instrumentation, instrumented
+from migrations import (
+    DEFAULT_BATCH_SIZE,
+    BatchedStep,
+    Migration,
+    MigrationProgress,
+    run_migrations,
+    schema_version,
+)
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE: int = 10_000
+
+DEFAULT_PAGE_SIZE: int = 500
+
+# Seconds to wait for a free pooled reader before giving up; an iter_* generator that is
+# neither exhausted nor closed keeps its reader
+DEFAULT_READER_TIMEOUT: float = 30.0
+
+# Pages copied per step of an online backup; other connections can write between steps
+DEFAULT_BACKUP_PAGES: int = 1024
+
+# Called as progress(status, remaining_pages, total_pages) after each backup step
+BackupProgress = Callable[[int, int, int], object]
+
+# Connection PRAGMA settings per performance profile. All profiles use WAL so that
+# readers (e.g. the GUI) and a writer (e.g. a batch import) can share one file.
+PROFILES: Dict[str, Dict[str, object]] = {
+    # Every commit is fsynced; safest for interactive use
+    "durable": {
+        "journal_mode": "wal",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -16_000,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5_000,
+    },
+    # Commits survive application crashes but may roll back on power loss
+    "fast": {
+        "journal_mode": "wal",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64_000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5_000,
+    },
+    # Large imports; no fsync at all, so a power loss can corrupt the file
+    "bulk": {
+        "journal_mode": "wal",
+        "synchronous": "OFF",
+        "mmap_size": 1024 * 1024 * 1024,
+        "cache_size": -256_000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30_000,
+    },
+}
+
+DEFAULT_PROFILE: str = "durable"
+
+# Values reported by PRAGMA synchronous / temp_store, mapped back to their names
+SYNCHRONOUS_NAMES: Dict[int, str] = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+TEMP_STORE_NAMES: Dict[int, str] = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+# Tables of the current schema version
+TABLE_QUERIES: Tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS Employees (
+        employee_id INTEGER PRIMARY KEY,
+        employee_name TEXT NOT NULL UNIQUE,
+        department TEXT NOT NULL,
+        contact_phone TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Documents (
+        document_id INTEGER PRIMARY KEY,
+        document_designation TEXT NOT NULL UNIQUE,
+        document_name TEXT NOT NULL,
+        document_quantity INTEGER NOT NULL
+    )
+    """,
+    # Many-to-many relationship, stored as a compact B-tree of integer key pairs
+    """
+    CREATE TABLE IF NOT EXISTS Employees_Documents (
+        employee_id INTEGER NOT NULL,
+        document_id INTEGER NOT NULL,
+        document_instance_number INTEGER NOT NULL,
+        FOREIGN KEY (employee_id) REFERENCES Employees(employee_id),
+        FOREIGN KEY (document_id) REFERENCES Documents(document_id),
+        PRIMARY KEY (employee_id, document_id)
+    ) WITHOUT ROWID
+    """,
+)
+
+# Secondary indexes, created by create_tables and added to existing files by migrations
+INDEX_QUERIES: Tuple[str, ...] = (
+    # Document -> employees lookups (the primary key serves the reverse); in a WITHOUT ROWID
+    # table the index also holds the primary key, so it covers (document_id, employee_id)
+    """
+    CREATE INDEX IF NOT EXISTS idx_employees_documents_document
+    ON Employees_Documents (document_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_employees_department
+    ON Employees (department)
+    """,
+)
+
+# Full-text search tables over Employees and Documents, kept in sync by triggers.
+# Prefix indexes make short type-ahead queries ("Iv", "Fin") index lookups.
+SEARCH_QUERIES: Tuple[str, ...] = (
+    # While a bulk load holds a row here, inside its own uncommitted transaction, the insert
+    # triggers are skipped and the load indexes its new rows in batches (SEARCH_BACKFILL_QUERIES)
+    """
+    CREATE TABLE IF NOT EXISTS Search_Index_Deferred (active INTEGER PRIMARY KEY)
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS Employees_Search USING fts5(
+        employee_name, department, contact_phone,
+        content = 'Employees', content_rowid = 'rowid', prefix = '1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS Employees_Search_Insert AFTER INSERT ON Employees
+    WHEN NOT EXISTS (SELECT 1 FROM Search_Index_Deferred) BEGIN
+        INSERT INTO Employees_Search (rowid, employee_name, department, contact_phone)
+        VALUES (new.rowid, new.employee_name, new.department, new.contact_phone);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS Employees_Search_Delete AFTER DELETE ON Employees BEGIN
+        INSERT INTO Employees_Search (Employees_Search, rowid, employee_name, department, contact_phone)
+        VALUES ('delete', old.rowid, old.employee_name, old.department, old.contact_phone);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS Employees_Search_Update AFTER UPDATE ON Employees BEGIN
+        INSERT INTO Employees_Search (Employees_Search, rowid, employee_name, department, contact_phone)
+        VALUES ('delete', old.rowid, old.employee_name, old.department, old.contact_phone);
+        INSERT INTO Employees_Search (rowid, employee_name, department, contact_phone)
+        VALUES (new.rowid, new.employee_name, new.department, new.contact_phone);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS Documents_Search USING fts5(
+        document_designation, document_name,
+        content = 'Documents', content_rowid = 'rowid', prefix = '1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS Documents_Search_Insert AFTER INSERT ON Documents
+    WHEN NOT EXISTS (SELECT 1 FROM Search_Index_Deferred) BEGIN
+        INSERT INTO Documents_Search (rowid, document_designation, document_name)
+        VALUES (new.rowid, new.document_designation, new.document_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS Documents_Search_Delete AFTER DELETE ON Documents BEGIN
+        INSERT INTO Documents_Search (Documents_Search, rowid, document_designation, document_name)
+        VALUES ('delete', old.rowid, old.document_designation, old.document_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS Documents_Search_Update AFTER UPDATE ON Documents BEGIN
+        INSERT INTO Documents_Search (Documents_Search, rowid, document_designation, document_name)
+        VALUES ('delete', old.rowid, old.document_designation, old.document_name);
+        INSERT INTO Documents_Search (rowid, document_designation, document_name)
+        VALUES (new.rowid, new.document_designation, new.document_name);
+    END
+    """,
+)
+
+# Index the rows of a table in the rowid range ?1 (exclusive) to ?2 (inclusive)
+SEARCH_BACKFILL_QUERIES: Dict[str, str] = {
+    "Employees": """
+        INSERT INTO Employees_Search (rowid, employee_name, department, contact_phone)
+        SELECT rowid, employee_name, department, contact_phone FROM Employees
+        WHERE rowid > ?1 AND rowid <= ?2
+    """,
+    "Documents": """
+        INSERT INTO Documents_Search (rowid, document_designation, document_name)
+        SELECT rowid, document_designation, document_name FROM Documents
+        WHERE rowid > ?1 AND rowid <= ?2
+    """,
+}
+
+DEFAULT_SEARCH_LIMIT: int = 20
+
+EMPLOYEES_BY_DOCUMENT_QUERY: str = """
+    SELECT e.employee_name
+    FROM Documents AS d
+    JOIN Employees_Documents AS ed ON ed.document_id = d.document_id
+    JOIN Employees AS e ON e.employee_id = ed.employee_id
+    WHERE d.document_designation = ?
+"""
+DOCUMENTS_BY_EMPLOYEE_QUERY: str = """
+    SELECT d.document_designation
+    FROM Employees AS e
+    JOIN Employees_Documents AS ed ON ed.employee_id = e.employee_id
+    JOIN Documents AS d ON d.document_id = ed.document_id
+    WHERE e.employee_name = ?
+"""
+
+# Batched variants; {columns} is the name alone or the EmployeeLink / DocumentLink columns,
+# {placeholders} one "?" per key in the IN list
+EMPLOYEES_BY_DOCUMENTS_QUERY: str = """
+    SELECT d.document_designation, {columns}
+    FROM Documents AS d
+    JOIN Employees_Documents AS ed ON ed.document_id = d.document_id
+    JOIN Employees AS e ON e.employee_id = ed.employee_id
+    WHERE d.document_designation IN ({placeholders})
+"""
+DOCUMENTS_BY_EMPLOYEES_QUERY: str = """
+    SELECT e.employee_name, {columns}
+    FROM Employees AS e
+    JOIN Employees_Documents AS ed ON ed.employee_id = e.employee_id
+    JOIN Documents AS d ON d.document_id = ed.document_id
+    WHERE e.employee_name IN ({placeholders})
+"""
+
+EMPLOYEE_LINK_COLUMNS: str = "e.employee_name, e.department, e.contact_phone, ed.document_instance_number"
+DOCUMENT_LINK_COLUMNS: str = "d.document_designation, d.document_name, d.document_quantity, ed.document_instance_number"
+
+# Keys per IN list; stays below the 999 host parameter limit of older SQLite builds
+DEFAULT_KEYS_PER_QUERY: int = 500
+
+# Lookup cache keys
+ALL_EMPLOYEES_KEY: Tuple[str] = ("employees",)
+ALL_DOCUMENTS_KEY: Tuple[str] = ("documents",)
+
+
+def employees_by_document_key(document_designation: str) -> Tuple[str, str]:
+    return "employees_by_document", document_designation
+
+
+def documents_by_employee_key(employee_name: str) -> Tuple[str, str]:
+    return "documents_by_employee", employee_name
+
+
+class BulkResult(NamedTuple):
+    """Row counts reported by the bulk insert and link methods."""
+
+    inserted: int = 0
+    skipped: int = 0
+    updated: int = 0
+
+    @property
+    def total(self) -> int:
+        """Total number of rows processed."""
+        return self.inserted + self.skipped + self.updated
+
+
+class EmployeeLink(NamedTuple):
+    """An employee linked to a document, as returned by get_employees_by_documents(records=True)."""
+
+    employee_name: str
+    department: str
+    contact_phone: str
+    document_instance_number: int
+
+
+class DocumentLink(NamedTuple):
+    """A document linked to an employee, as returned by get_documents_by_employees(records=True)."""
+
+    document_designation: str
+    document_name: str
+    document_quantity: int
+    document_instance_number: int
+
+
+class LookupCache:
+    """
+    Thread-safe LRU cache for lookup results, bounded by size and optionally by age.
+    Entries are evicted by the write methods once their transaction has committed.
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+        self._entries: "OrderedDict[Hashable, Tuple[List[str], float]]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        # Bumped on every invalidation so that loads racing with a write are not stored
+        self._version: int = 0
+
+    def get_or_load(self, key: Hashable, load: Callable[[], List[str]]) -> List[str]:
+        """Return a copy of the cached value for key, calling load on a miss."""
+        with self._lock:
+            entry: Optional[Tuple[List[str], float]] = self._entries.get(key)
+            if entry is not None:
+                if entry[1] >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(entry[0])
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            version: int = self._version
+
+        value: List[str] = load()
+
+        with self._lock:
+            if version == self._version:
+                expires_at: float = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+                self._entries[key] = (list(value), expires_at)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """Drop the given keys."""
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._version += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss, eviction, expiration and invalidation counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class Session:
+    """A connection checked out for one transaction; every call gets its own cursor."""
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        write: bool,
+        max_invalidations: int = 0,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
+        self.connection: sqlite3.Connection = connection
+        self.write: bool = write
+        self._instrumentation: Optional[Instrumentation] = instrumentation
+        # Cache keys to evict once the transaction ends; past max_invalidations the whole cache is cleared
+        self.invalidated: Set[Hashable] = set()
+        self.invalidate_all: bool = False
+        self._max_invalidations: int = max_invalidations
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Mark lookup cache keys affected by a write in this session."""
+        if self._max_invalidations and not self.invalidate_all:
+            self.invalidated.update(keys)
+            if len(self.invalidated) > self._max_invalidations:
+                self.invalidated.clear()
+                self.invalidate_all = True
+
+    def execute(self, query: str, parameters: Tuple = ()) -> sqlite3.Cursor:
+        """
+        Execute a statement on a new cursor. Only the first step is timed, so queries
+        returning many rows should use fetchall.
+        """
+        if self._instrumentation is None:
+            return self.connection.execute(query, parameters)
+        start: float = time.perf_counter()
+        cursor: sqlite3.Cursor = self.connection.execute(query, parameters)
+        self._instrumentation.record_statement(
+            self.connection, query, parameters, time.perf_counter() - start, cursor.rowcount
+        )
+        return cursor
+
+    def fetchall(self, query: str, parameters: Tuple = ()) -> List[Tuple]:
+        """Execute a query and fetch every row; the recorded time and row count include the fetch."""
+        if self._instrumentation is None:
+            return self.connection.execute(query, parameters).fetchall()
+        start: float = time.perf_counter()
+        rows: List[Tuple] = self.connection.execute(query, parameters).fetchall()
+        self._instrumentation.record_statement(
+            self.connection, query, parameters, time.perf_counter() - start, len(rows)
+        )
+        return rows
+
+    def executemany(self, query: str, rows: Iterable[Tuple]) -> sqlite3.Cursor:
+        """Execute a statement for every row on a new cursor."""
+        if self._instrumentation is None:
+            return self.connection.executemany(query, rows)
+        start: float = time.perf_counter()
+        cursor: sqlite3.Cursor = self.connection.executemany(query, rows)
+        self._instrumentation.record_statement(
+            self.connection, query, None, time.perf_counter() - start, cursor.rowcount
+        )
+        return cursor
+
+
+def _match_expression(prefix: str) -> Optional[str]:
+    """
+    Turn user input into an FTS5 query that prefix-matches every word,
+    e.g. 'Iva fin' -> '"Iva"* "fin"*'. Returns None if nothing is searchable.
+    """
+    terms: List[str] = [
+        '"' + word.replace('"', '""') + '"*' for word in prefix.split() if any(char.isalnum() for char in word)
+    ]
+    return " ".join(terms) if terms else None
+
+
+def _has_name_keyed_links(session: Session) -> bool:
+    columns: Set[str] = {row[1] for row in session.execute("PRAGMA table_info(Employees_Documents)")}
+    return "employee_name" in columns
+
+
+def _has_no_search_tables(session: Session) -> bool:
+    query: str = "SELECT 1 FROM sqlite_master WHERE name = 'Employees_Search'"
+    return session.execute(query).fetchone() is None
+
+
+def _rename_name_keyed_tables(session: Session) -> None:
+    """Move the text-keyed tables aside and create the integer-keyed ones next to them."""
+    # Search tables, their triggers and the old indexes are recreated by later migrations
+    for name in ("Employees", "Documents"):
+        for event in ("Insert", "Delete", "Update"):
+            session.execute(f"DROP TRIGGER IF EXISTS {name}_Search_{event}")
+        session.execute(f"DROP TABLE IF EXISTS {name}_Search")
+    session.execute("DROP INDEX IF EXISTS idx_employees_documents_document")
+    session.execute("DROP INDEX IF EXISTS idx_employees_department")
+    for name in ("Employees", "Documents", "Employees_Documents"):
+        session.execute(f"ALTER TABLE {name} RENAME TO {name}_Legacy")
+    for query in TABLE_QUERIES:
+        session.execute(query)
+
+
+def _replace_search_insert_triggers(session: Session) -> None:
+    """Recreate the search insert triggers with the Search_Index_Deferred condition."""
+    for name in ("Employees", "Documents"):
+        session.execute(f"DROP TRIGGER IF EXISTS {name}_Search_Insert")
+    for query in SEARCH_QUERIES:
+        session.execute(query)
+
+
+# Schema history; PRAGMA user_version of a file is the version of the last migration applied.
+# Files created by create_tables start at SCHEMA_VERSION.
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(
+        1,
+        "integer surrogate keys and a WITHOUT ROWID link table",
+        (
+            _rename_name_keyed_tables,
+            # Keep the existing rowids as the new integer keys
+            BatchedStep(
+                "Employees_Legacy",
+                (
+                    """
+                    INSERT INTO Employees (employee_id, employee_name, department, contact_phone)
+                    SELECT rowid, employee_name, department, contact_phone FROM Employees_Legacy
+                    WHERE rowid > ?1 AND rowid <= ?2
+                    """,
+                ),
+            ),
+            BatchedStep(
+                "Documents_Legacy",
+                (
+                    """
+                    INSERT INTO Documents (document_id, document_designation, document_name, document_quantity)
+                    SELECT rowid, document_designation, document_name, document_quantity FROM Documents_Legacy
+                    WHERE rowid > ?1 AND rowid <= ?2
+                    """,
+                ),
+            ),
+            # Foreign keys were not enforced, so links may name unknown employees or documents;
+            # placeholder rows keep those links instead of dropping them
+            BatchedStep(
+                "Employees_Documents_Legacy",
+                (
+                    """
+                    INSERT INTO Employees (employee_name, department, contact_phone)
+                    SELECT employee_name, '', '' FROM Employees_Documents_Legacy
+                    WHERE rowid > ?1 AND rowid <= ?2
+                    ON CONFLICT (employee_name) DO NOTHING
+                    """,
+                    """
+                    INSERT INTO Documents (document_designation, document_name, document_quantity)
+                    SELECT document_designation, '', 0 FROM Employees_Documents_Legacy
+                    WHERE rowid > ?1 AND rowid <= ?2
+                    ON CONFLICT (document_designation) DO NOTHING
+                    """,
+                    """
+                    INSERT INTO Employees_Documents (employee_id, document_id, document_instance_number)
+                    SELECT e.employee_id, d.document_id, l.document_instance_number
+                    FROM Employees_Documents_Legacy AS l
+                    JOIN Employees AS e ON e.employee_name = l.employee_name
+                    JOIN Documents AS d ON d.document_designation = l.document_designation
+                    WHERE l.rowid > ?1 AND l.rowid <= ?2
+                    """,
+                ),
+            ),
+            "DROP TABLE Employees_Documents_Legacy",
+            "DROP TABLE Employees_Legacy",
+            "DROP TABLE Documents_Legacy",
+        ),
+        needed=_has_name_keyed_links,
+    ),
+    Migration(2, "secondary indexes", INDEX_QUERIES),
+    Migration(
+        3,
+        "full-text search tables",
+        (
+            *SEARCH_QUERIES,
+            # Index the rows written before the search tables existed
+            BatchedStep("Employees", (SEARCH_BACKFILL_QUERIES["Employees"],)),
+            BatchedStep("Documents", (SEARCH_BACKFILL_QUERIES["Documents"],)),
+        ),
+        needed=_has_no_search_tables,
+    ),
+    Migration(4, "search insert triggers that bulk loads can defer", (_replace_search_insert_triggers,)),
+)
+SCHEMA_VERSION: int = MIGRATIONS[-1].version
+
+
+def _chunked(rows: Iterable[Tuple], chunk_size: int) -> Iterator[List[Tuple]]:
+    """Split an iterable of rows into lists of at most chunk_size rows."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    iterator: Iterator[Tuple] = iter(rows)
+    while True:
+        chunk: List[Tuple] = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
 
 
 class DatabaseManager:
-    def __init__(self, db_name: str) -> None:
-        """Initialize the SQLite database connection."""
-        self.connection: sqlite3.Connection = sqlite3.connect(db_name)
+    def __init__(
+        self,
+        db_name: str,
+        profile: str = DEFAULT_PROFILE,
+        pool_size: int = 0,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None,
+        instrument: bool = False,
+        slow_query_ms: Optional[float] = None,
+        reader_timeout: float = DEFAULT_READER_TIMEOUT,
+    ) -> None:
+        """
+        Initialize the SQLite database connection with the given performance profile.
+        With pool_size > 0 the manager is thread-safe: one writer connection serialized
+        by a lock plus pool_size reader connections handed out per call or session;
+        waiting longer than reader_timeout seconds for a reader raises RuntimeError.
+        With cache_size > 0 the get_* lookups are served from a LookupCache; cache_ttl
+        bounds how stale an entry can get when another process writes to the file.
+        With instrument (implied by slow_query_ms) method, statement and commit latencies
+        are collected for stats(), and statements slower than slow_query_ms are logged.
+        """
+        if pool_size < 0:
+            raise ValueError("pool_size must not be negative")
+        if pool_size and db_name == ":memory:":
+            raise ValueError("A pooled DatabaseManager needs a database file, not :memory:")
+        self.db_name: str = db_name
+        self.pool_size: int = pool_size
+        self.reader_timeout: float = reader_timeout
+        self.connection: sqlite3.Connection = sqlite3.connect(db_name, check_same_thread=not pool_size)
         self.cursor: sqlite3.Cursor = self.connection.cursor()
+        self._writer_lock: Optional[threading.Lock] = threading.Lock() if pool_size else None
+        self._readers: Optional["queue.Queue[sqlite3.Connection]"] = None
+        # Every reader created, including those checked out when close() runs
+        self._reader_connections: List[sqlite3.Connection] = []
+        self._local: threading.local = threading.local()
+        self.cache: Optional[LookupCache] = LookupCache(cache_size, cache_ttl) if cache_size else None
+        self.instrumentation: Optional[Instrumentation] = (
+            Instrumentation(slow_query_ms) if instrument or slow_query_ms is not None else None
+        )
+        self.profile: str = ""
+        self.apply_profile(profile)
+        self.migrate()
+        if pool_size:
+            self._readers = queue.Queue()
+            for _ in range(pool_size):
+                reader: sqlite3.Connection = sqlite3.connect(db_name, check_same_thread=False)
+                self._apply_pragmas(reader, profile)
+                self._reader_connections.append(reader)
+                self._readers.put(reader)
 
-    def create_tables(self) -> None:
-        """Create the Employees, Documents, and Employees_Documents tables."""
-        # Create Employees table
-        query: str = """
-            CREATE TABLE IF NOT EXISTS Employees (
-                employee_name TEXT PRIMARY KEY NOT NULL,
-                department TEXT NOT NULL,
-                contact_phone TEXT NOT NULL
-            )
+    @contextmanager
+    def session(self, write: bool = True) -> Iterator[Session]:
         """
-        self.cursor.execute(query)
-
-        # Create Documents table
-        query: str = """
-            CREATE TABLE IF NOT EXISTS Documents (
-                document_designation TEXT PRIMARY KEY NOT NULL,
-                document_name TEXT NOT NULL,
-                document_quantity INTEGER NOT NULL
-            )
+        Run a block as one transaction: committed on success, rolled back on error.
+        Manager methods called inside the block on the same thread join the session.
+        In pooled mode a read session (write=False) sees a single WAL snapshot.
         """
-        self.cursor.execute(query)
+        current: Optional[Session] = getattr(self._local, "session", None)
+        if current is not None:
+            if write and not current.write:
+                raise RuntimeError("Cannot write inside a read-only session")
+            yield current
+            return
 
-        # Create Employees_Documents table for many-to-many relationship
-        query: str = """
-            CREATE TABLE IF NOT EXISTS Employees_Documents (
-                employee_name TEXT NOT NULL,
-                document_designation TEXT NOT NULL,
-                document_instance_number INTEGER NOT NULL,
-                FOREIGN KEY (employee_name) REFERENCES Employees(employee_name),
-                FOREIGN KEY (document_designation) REFERENCES Documents(document_designation),
-                PRIMARY KEY (employee_name, document_designation)
-            )
+        max_invalidations: int = self.cache.max_size if self.cache is not None else 0
+        session: Optional[Session] = None
+        try:
+            with self._checkout(write, begin=write or self._readers is not None) as connection:
+                session = Session(connection, write, max_invalidations, self.instrumentation)
+                self._local.session = session
+                try:
+                    yield session
+                finally:
+                    self._local.session = None
+        finally:
+            # Evict only after the commit, so concurrent readers cannot cache the old rows again
+            if session is not None and self.cache is not None:
+                if session.invalidate_all:
+                    self.cache.clear()
+                elif session.invalidated:
+                    self.cache.invalidate(session.invalidated)
+
+    @contextmanager
+    def _checkout(self, write: bool, begin: bool) -> Iterator[sqlite3.Connection]:
+        """Take the writer (under its lock) or a pooled reader, optionally inside a transaction."""
+        if write:
+            if self._writer_lock is not None:
+                self._writer_lock.acquire()
+            try:
+                with self._transaction(self.connection, "BEGIN IMMEDIATE" if begin else None):
+                    yield self.connection
+            finally:
+                if self._writer_lock is not None:
+                    self._writer_lock.release()
+        elif self._readers is None:
+            with self._transaction(self.connection, "BEGIN" if begin else None):
+                yield self.connection
+        else:
+            reader: sqlite3.Connection = self._take_reader()
+            try:
+                with self._transaction(reader, "BEGIN" if begin else None):
+                    yield reader
+            finally:
+                self._readers.put(reader)
+
+    def _take_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get(timeout=self.reader_timeout)
+        except queue.Empty:
+            raise RuntimeError(
+                f"No pooled reader became free within {self.reader_timeout} s; "
+                "iter_* generators that are no longer needed must be exhausted or closed"
+            ) from None
+
+    @contextmanager
+    def _transaction(self, connection: sqlite3.Connection, begin: Optional[str]) -> Iterator[None]:
+        """Begin a transaction unless one is already open, and end it when the block exits."""
+        started: bool = begin is not None and not connection.in_transaction
+        if started:
+            connection.execute(begin)
+        try:
+            yield
+        except BaseException:
+            if started:
+                connection.rollback()
+            raise
+        if not started:
+            return
+        if self.instrumentation is None or begin != "BEGIN IMMEDIATE":
+            connection.commit()
+            return
+        start: float = time.perf_counter()
+        connection.commit()
+        self.instrumentation.record_commit(time.perf_counter() - start)
+
+    def apply_profile(self, profile: str) -> None:
+        """Apply the PRAGMA settings of one of the PROFILES to every connection."""
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile {profile!r}; expected one of {', '.join(PROFILES)}.")
+        with self._all_connections() as connections:
+            for connection in connections:
+                self._apply_pragmas(connection, profile)
+        self.profile = profile
+
+    @contextmanager
+    def _all_connections(self) -> Iterator[List[sqlite3.Connection]]:
+        """Check out the writer and every pooled reader so that none of them is in use."""
+        if self._writer_lock is not None:
+            self._writer_lock.acquire()
+        readers: List[sqlite3.Connection] = []
+        try:
+            if self._readers is not None:
+                for _ in range(self.pool_size):
+                    readers.append(self._take_reader())
+            yield [self.connection] + readers
+        finally:
+            for reader in readers:
+                self._readers.put(reader)
+            if self._writer_lock is not None:
+                self._writer_lock.release()
+
+    @staticmethod
+    def _apply_pragmas(connection: sqlite3.Connection, profile: str) -> None:
+        # journal_mode cannot change inside a transaction
+        connection.commit()
+        for name, value in PROFILES[profile].items():
+            connection.execute(f"PRAGMA {name} = {value}").fetchall()
+
+    def settings(self) -> Dict[str, object]:
+        """Return the PRAGMA settings currently active on the connection."""
+        active: Dict[str, object] = {}
+        with self.session(write=False) as session:
+            for name in PROFILES[DEFAULT_PROFILE]:
+                row: Optional[Tuple] = session.execute(f"PRAGMA {name}").fetchone()
+                active[name] = row[0] if row is not None else None
+        active["synchronous"] = SYNCHRONOUS_NAMES.get(active["synchronous"], active["synchronous"])
+        active["temp_store"] = TEMP_STORE_NAMES.get(active["temp_store"], active["temp_store"])
+        return active
+
+    @instrumented
+    def migrate(self, batch_size: int = DEFAULT_BATCH_SIZE, progress: Optional[MigrationProgress] = None) -> int:
+        """
+        Apply the pending schema migrations and return the schema version of the file.
+        Runs automatically on open; large tables are rewritten in resumable batches of
+        batch_size rows, each in its own transaction.
         """
-        self.cursor.execute(query)
+        with self.session(write=False) as session:
+            version: int = schema_version(session)
+            # A file without tables gets the current schema from create_tables
+            if session.execute("SELECT 1 FROM sqlite_master").fetchone() is None:
+                return version
+        if version >= SCHEMA_VERSION:
+            return version
+        return run_migrations(self.session, MIGRATIONS, batch_size, progress)
 
-        self.connection.commit()
+    @instrumented
+    def create_tables(self) -> None:
+        """Create the Employees, Documents, and Employees_Documents tables."""
+        with self.session() as session:
+            for query in TABLE_QUERIES + INDEX_QUERIES + SEARCH_QUERIES:
+                session.execute(query)
+            if schema_version(session) < SCHEMA_VERSION:
+                session.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
+    @instrumented
     def insert_employee(self, employee_name: str, department: str, contact_phone: str) -> None:
         """Insert a new employee or skip if the employee already exists."""
-        query: str = "SELECT 1 FROM Employees WHERE employee_name = ?"
-        self.cursor.execute(query, (employee_name,))
-        result: Optional[Tuple[int]] = self.cursor.fetchone()
+        with self.session() as session:
+            query: str = "SELECT 1 FROM Employees WHERE employee_name = ?"
+            result: Optional[Tuple[int]] = session.execute(query, (employee_name,)).fetchone()
 
-        if result is not None:
-            print(f"Employee {employee_name} already exists in the database. Skipping insertion.")
-        else:
-            # Insert new employee into Employees table
-            query: str = """
-                INSERT INTO Employees (employee_name, department, contact_phone)
-                VALUES (?, ?, ?)
-            """
-            self.cursor.execute(query, (employee_name, department, contact_phone))
-            self.connection.commit()
+            if result is not None:
+                logger.info(
+                    "Employee %s already exists, skipping insertion",
+                    employee_name,
+                    extra={"event": "duplicate_employee", "employee_name": employee_name},
+                )
+            else:
+                # Insert new employee into Employees table
+                query: str = """
+                    INSERT INTO Employees (employee_name, department, contact_phone)
+                    VALUES (?, ?, ?)
+                """
+                session.execute(query, (employee_name, department, contact_phone))
+                session.invalidate(ALL_EMPLOYEES_KEY)
 
+    @instrumented
     def insert_document(self, document_designation: str, document_name: str, document_quantity: int) -> None:
         """Insert a new document into the Documents table or skip if it exists."""
-        query: str = "SELECT 1 FROM Documents WHERE document_designation = ?"
-        self.cursor.execute(query, (document_designation,))
-        result: Optional[Tuple[int]] = self.cursor.fetchone()
+        with self.session() as session:
+            query: str = "SELECT 1 FROM Documents WHERE document_designation = ?"
+            result: Optional[Tuple[int]] = session.execute(query, (document_designation,)).fetchone()
 
-        if result is None:
-            # Insert new document into Documents table
-            query: str = """
-                INSERT INTO Documents (document_designation, document_name, document_quantity)
-                VALUES (?, ?, ?)
-            """
-            self.cursor.execute(query, (document_designation, document_name, document_quantity))
-            self.connection.commit()
-        else:
-            print(f"Document with designation {document_designation} already exists. Skipping insertion.")
+            if result is None:
+                # Insert new document into Documents table
+                query: str = """
+                    INSERT INTO Documents (document_designation, document_name, document_quantity)
+                    VALUES (?, ?, ?)
+                """
+                session.execute(query, (document_designation, document_name, document_quantity))
+                session.invalidate(ALL_DOCUMENTS_KEY)
+            else:
+                logger.info(
+                    "Document %s already exists, skipping insertion",
+                    document_designation,
+                    extra={"event": "duplicate_document", "document_designation": document_designation},
+                )
 
+    @instrumented
     def link_employee_to_document(
         self, employee_name: str, document_designation: str, document_instance_number: int
     ) -> None:
         """
         Link an employee to a document in the Employees_Documents table
         or update the instance number if the link already exists.
+        Raises ValueError if the employee or the document does not exist.
         """
-        query: str = """
-            SELECT document_instance_number FROM Employees_Documents 
-            WHERE employee_name = ? AND document_designation = ?
-        """
-        self.cursor.execute(query, (employee_name, document_designation))
-        result: Optional[Tuple[int]] = self.cursor.fetchone()
-
-        if result is None:
-            # Link employee to document in Employees_Documents table
+        with self.session() as session:
+            employee_id: int = self._employee_id(session, employee_name)
+            document_id: int = self._document_id(session, document_designation)
             query: str = """
-                INSERT INTO Employees_Documents (employee_name, document_designation, document_instance_number)
-                VALUES (?, ?, ?)
+                SELECT document_instance_number FROM Employees_Documents 
+                WHERE employee_id = ? AND document_id = ?
             """
-            self.cursor.execute(query, (employee_name, document_designation, document_instance_number))
-        else:
-            # Update document_instance_number if it differs
-            if result[0] != document_instance_number:
-                print(f"Updating instance number for employee {employee_name} and document {document_designation}.")
+            result: Optional[Tuple[int]] = session.execute(query, (employee_id, document_id)).fetchone()
+
+            if result is None:
+                # Link employee to document in Employees_Documents table
                 query: str = """
-                    UPDATE Employees_Documents 
-                    SET document_instance_number = ? 
-                    WHERE employee_name = ? AND document_designation = ?
+                    INSERT INTO Employees_Documents (employee_id, document_id, document_instance_number)
+                    VALUES (?, ?, ?)
                 """
-                self.cursor.execute(query, (document_instance_number, employee_name, document_designation))
+                session.execute(query, (employee_id, document_id, document_instance_number))
+                session.invalidate(
+                    documents_by_employee_key(employee_name), employees_by_document_key(document_designation)
+                )
+            else:
+                # Update document_instance_number if it differs
+                if result[0] != document_instance_number:
+                    logger.info(
+                        "Updating instance number of %s for employee %s to %d",
+                        document_designation,
+                        employee_name,
+                        document_instance_number,
+                        extra={
+                            "event": "instance_number_updated",
+                            "employee_name": employee_name,
+                            "document_designation": document_designation,
+                            "document_instance_number": document_instance_number,
+                        },
+                    )
+                    query: str = """
+                        UPDATE Employees_Documents 
+                        SET document_instance_number = ? 
+                        WHERE employee_id = ? AND document_id = ?
+                    """
+                    session.execute(query, (document_instance_number, employee_id, document_id))
+
+    @staticmethod
+    def _employee_id(session: Session, employee_name: str) -> int:
+        query: str = "SELECT employee_id FROM Employees WHERE employee_name = ?"
+        row: Optional[Tuple[int]] = session.execute(query, (employee_name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Employee {employee_name} does not exist.")
+        return row[0]
+
+    @staticmethod
+    def _document_id(session: Session, document_designation: str) -> int:
+        query: str = "SELECT document_id FROM Documents WHERE document_designation = ?"
+        row: Optional[Tuple[int]] = session.execute(query, (document_designation,)).fetchone()
+        if row is None:
+            raise ValueError(f"Document with designation {document_designation} does not exist.")
+        return row[0]
+
+    @instrumented
+    def insert_employees_bulk(
+        self,
+        employees: Iterable[Tuple[str, str, str]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        update_existing: bool = False,
+    ) -> BulkResult:
+        """
+        Insert (employee_name, department, contact_phone) rows in one transaction.
+        Existing employees are skipped, or updated when update_existing is set.
+        """
+        insert_query: str = """
+            INSERT INTO Employees (employee_name, department, contact_phone)
+            VALUES (?, ?, ?)
+            ON CONFLICT (employee_name) DO NOTHING
+        """
+        update_query: Optional[str] = None
+        if update_existing:
+            update_query = """
+                UPDATE Employees
+                SET department = ?2, contact_phone = ?3
+                WHERE employee_name = ?1 AND (department != ?2 OR contact_phone != ?3)
+            """
+        return self._execute_bulk(
+            employees, insert_query, update_query, chunk_size, lambda row: (ALL_EMPLOYEES_KEY,), "Employees"
+        )
+
+    @instrumented
+    def insert_documents_bulk(
+        self,
+        documents: Iterable[Tuple[str, str, int]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        update_existing: bool = False,
+    ) -> BulkResult:
+        """
+        Insert (document_designation, document_name, document_quantity) rows in one transaction.
+        Existing documents are skipped, or updated when update_existing is set.
+        """
+        insert_query: str = """
+            INSERT INTO Documents (document_designation, document_name, document_quantity)
+            VALUES (?, ?, ?)
+            ON CONFLICT (document_designation) DO NOTHING
+        """
+        update_query: Optional[str] = None
+        if update_existing:
+            update_query = """
+                UPDATE Documents
+                SET document_name = ?2, document_quantity = ?3
+                WHERE document_designation = ?1 AND (document_name != ?2 OR document_quantity != ?3)
+            """
+        return self._execute_bulk(
+            documents, insert_query, update_query, chunk_size, lambda row: (ALL_DOCUMENTS_KEY,), "Documents"
+        )
+
+    @instrumented
+    def link_bulk(
+        self, links: Iterable[Tuple[str, str, int]], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> BulkResult:
+        """
+        Link (employee_name, document_designation, document_instance_number) rows in one
+        transaction, updating the instance number of links that already exist.
+        Rows naming an unknown employee or document are counted as skipped.
+        """
+        insert_query: str = """
+            INSERT INTO Employees_Documents (employee_id, document_id, document_instance_number)
+            SELECT e.employee_id, d.document_id, ?3
+            FROM Employees AS e, Documents AS d
+            WHERE e.employee_name = ?1 AND d.document_designation = ?2
+            ON CONFLICT (employee_id, document_id) DO NOTHING
+        """
+        update_query: str = """
+            UPDATE Employees_Documents
+            SET document_instance_number = ?3
+            WHERE employee_id = (SELECT employee_id FROM Employees WHERE employee_name = ?1)
+              AND document_id = (SELECT document_id FROM Documents WHERE document_designation = ?2)
+              AND document_instance_number != ?3
+        """
+        return self._execute_bulk(
+            links,
+            insert_query,
+            update_query,
+            chunk_size,
+            lambda row: (documents_by_employee_key(row[0]), employees_by_document_key(row[1])),
+        )
+
+    def _execute_bulk(
+        self,
+        rows: Iterable[Tuple],
+        insert_query: str,
+        update_query: Optional[str],
+        chunk_size: int,
+        cache_keys: Callable[[Tuple], Tuple[Hashable, ...]],
+        search_table: Optional[str] = None,
+    ) -> BulkResult:
+        """
+        Stream rows through executemany in chunks inside one session.
+        Rows the insert ignores are passed to update_query (if any); the rest are skipped.
+        cache_keys names the lookup cache entries a row may affect. Rows inserted into
+        search_table are indexed for search once per chunk instead of by the per-row trigger.
+        """
+        inserted: int = 0
+        updated: int = 0
+        processed: int = 0
+        with self.session() as session:
+            if search_table is not None:
+                session.execute("INSERT OR IGNORE INTO Search_Index_Deferred (active) VALUES (1)")
+            try:
+                for chunk in _chunked(rows, chunk_size):
+                    processed += len(chunk)
+                    if search_table is not None:
+                        last_rowid: int = self._max_rowid(session, search_table)
+                    # rowcount excludes rows written by triggers (e.g. the search tables)
+                    chunk_inserted: int = session.executemany(insert_query, chunk).rowcount
+                    inserted += chunk_inserted
+                    if search_table is not None and chunk_inserted:
+                        session.execute(
+                            SEARCH_BACKFILL_QUERIES[search_table],
+                            (last_rowid, self._max_rowid(session, search_table)),
+                        )
+                    if update_query is not None:
+                        updated += session.executemany(update_query, chunk).rowcount
+                    if self.cache is not None:
+                        for row in chunk:
+                            session.invalidate(*cache_keys(row))
+            finally:
+                if search_table is not None:
+                    session.execute("DELETE FROM Search_Index_Deferred")
+        return BulkResult(inserted=inserted, skipped=processed - inserted - updated, updated=updated)
 
-        self.connection.commit()
+    @staticmethod
+    def _max_rowid(session: Session, table: str) -> int:
+        return session.execute(f"SELECT IFNULL(MAX(rowid), 0) FROM {table}").fetchone()[0]
 
+    @instrumented
     def get_all_documents(self) -> List[str]:
         """Retrieve all document designations from the Documents table."""
         query: str = "SELECT document_designation FROM Documents"
-        self.cursor.execute(query)
-        documents: List[str] = [row[0] for row in self.cursor.fetchall()]
-        return documents
+        return self._cached_lookup(ALL_DOCUMENTS_KEY, query)
 
+    @instrumented
     def get_all_employees(self) -> List[str]:
         """Retrieve all employee names from the Employees table."""
         query: str = "SELECT employee_name FROM Employees"
-        self.cursor.execute(query)
-        employees: List[str] = [row[0] for row in self.cursor.fetchall()]
-        return employees
+        return self._cached_lookup(ALL_EMPLOYEES_KEY, query)
 
+    @instrumented
     def get_employees_by_document(self, document_designation: str) -> List[str]:
         """Get all employees linked to the specified document."""
-        query: str = "SELECT employee_name FROM Employees_Documents WHERE document_designation = ?"
-        self.cursor.execute(query, (document_designation,))
-        employees: List[str] = [row[0] for row in self.cursor.fetchall()]
-        return employees
+        key: Tuple[str, str] = employees_by_document_key(document_designation)
+        return self._cached_lookup(key, EMPLOYEES_BY_DOCUMENT_QUERY, (document_designation,))
 
+    @instrumented
     def get_documents_by_employee(self, employee_name: str) -> List[str]:
         """Get all documents linked to the specified employee."""
-        query: str = "SELECT document_designation FROM Employees_Documents WHERE employee_name = ?"
-        self.cursor.execute(query, (employee_name,))
-        documents: List[str] = [row[0] for row in self.cursor.fetchall()]
-        return documents
+        key: Tuple[str, str] = documents_by_employee_key(employee_name)
+        return self._cached_lookup(key, DOCUMENTS_BY_EMPLOYEE_QUERY, (employee_name,))
+
+    @instrumented
+    def get_employees_by_documents(
+        self,
+        document_designations: Iterable[str],
+        records: bool = False,
+        keys_per_query: int = DEFAULT_KEYS_PER_QUERY,
+    ) -> Dict[str, List]:
+        """
+        Get the employees linked to each of the given documents with one query per keys_per_query keys.
+        Returns {document_designation: [employee_name, ...]}, or lists of EmployeeLink with records=True;
+        documents without links (or unknown ones) map to an empty list.
+        """
+        if records:
+            return self._batch_lookup(
+                EMPLOYEES_BY_DOCUMENTS_QUERY, EMPLOYEE_LINK_COLUMNS, document_designations, EmployeeLink._make,
+                keys_per_query,
+            )
+        return self._batch_lookup(
+            EMPLOYEES_BY_DOCUMENTS_QUERY, "e.employee_name", document_designations, None, keys_per_query
+        )
+
+    @instrumented
+    def get_documents_by_employees(
+        self,
+        employee_names: Iterable[str],
+        records: bool = False,
+        keys_per_query: int = DEFAULT_KEYS_PER_QUERY,
+    ) -> Dict[str, List]:
+        """
+        Get the documents linked to each of the given employees with one query per keys_per_query keys.
+        Returns {employee_name: [document_designation, ...]}, or lists of DocumentLink with records=True;
+        employees without links (or unknown ones) map to an empty list.
+        """
+        if records:
+            return self._batch_lookup(
+                DOCUMENTS_BY_EMPLOYEES_QUERY, DOCUMENT_LINK_COLUMNS, employee_names, DocumentLink._make, keys_per_query
+            )
+        return self._batch_lookup(
+            DOCUMENTS_BY_EMPLOYEES_QUERY, "d.document_designation", employee_names, None, keys_per_query
+        )
+
+    def _batch_lookup(
+        self,
+        query: str,
+        columns: str,
+        keys: Iterable[str],
+        record: Optional[Callable[[Iterable], Tuple]],
+        keys_per_query: int,
+    ) -> Dict[str, List]:
+        """
+        Group the rows of query by their first column, querying the keys in IN lists of keys_per_query.
+        The remaining columns become a record, or a bare value if record is None.
+        """
+        result: Dict[str, List] = {key: [] for key in keys}
+        # All chunks are read from the same snapshot
+        with self.session(write=False) as session:
+            for chunk in _chunked(result, keys_per_query):
+                placeholders: str = ", ".join("?" * len(chunk))
+                statement: str = query.format(columns=columns, placeholders=placeholders)
+                rows: List[Tuple] = session.fetchall(statement, tuple(chunk))
+                if record is None:
+                    for key, value in rows:
+                        result[key].append(value)
+                else:
+                    for key, *values in rows:
+                        result[key].append(record(values))
+        return result
+
+    @instrumented
+    def get_employees_page(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[str]:
+        """Get up to limit employee names in sorted order, starting after the given name."""
+        if after is None:
+            query: str = "SELECT employee_name FROM Employees ORDER BY employee_name LIMIT ?"
+            return self._lookup(query, (limit,))
+        query: str = "SELECT employee_name FROM Employees WHERE employee_name > ? ORDER BY employee_name LIMIT ?"
+        return self._lookup(query, (after, limit))
+
+    @instrumented
+    def get_documents_page(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> List[str]:
+        """Get up to limit document designations in sorted order, starting after the given designation."""
+        if after is None:
+            query: str = "SELECT document_designation FROM Documents ORDER BY document_designation LIMIT ?"
+            return self._lookup(query, (limit,))
+        query: str = """
+            SELECT document_designation FROM Documents
+            WHERE document_designation > ? ORDER BY document_designation LIMIT ?
+        """
+        return self._lookup(query, (after, limit))
+
+    @instrumented
+    def search_employees(self, prefix: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[str]:
+        """Find employees whose name, department or phone has words starting with the given prefix."""
+        expression: Optional[str] = _match_expression(prefix)
+        if expression is None:
+            return []
+        query: str = "SELECT employee_name FROM Employees_Search WHERE Employees_Search MATCH ? LIMIT ?"
+        return self._lookup(query, (expression, limit))
+
+    @instrumented
+    def search_documents(self, prefix: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[str]:
+        """Find documents whose designation or name has words starting with the given prefix."""
+        expression: Optional[str] = _match_expression(prefix)
+        if expression is None:
+            return []
+        query: str = "SELECT document_designation FROM Documents_Search WHERE Documents_Search MATCH ? LIMIT ?"
+        return self._lookup(query, (expression, limit))
+
+    def _cached_lookup(self, key: Hashable, query: str, parameters: Tuple = ()) -> List[str]:
+        """
+        Return the first column of query through the lookup cache. Inside an explicit session
+        the cache is bypassed: a write session may see uncommitted rows, and a read session's
+        snapshot may predate a write that has already invalidated the key.
+        """
+        if self.cache is None or getattr(self._local, "session", None) is not None:
+            return self._lookup(query, parameters)
+        return self.cache.get_or_load(key, lambda: self._lookup(query, parameters))
+
+    def _lookup(self, query: str, parameters: Tuple) -> List[str]:
+        with self.session(write=False) as session:
+            values: List[str] = [row[0] for row in session.fetchall(query, parameters)]
+        return values
+
+    def explain(self, query: str, parameters: Tuple = ()) -> List[str]:
+        """Return the steps of SQLite's EXPLAIN QUERY PLAN for the given query."""
+        with self.session(write=False) as session:
+            plan: List[str] = [row[3] for row in session.execute(f"EXPLAIN QUERY PLAN {query}", parameters)]
+        return plan
+
+    def iter_employees(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, str, str]]:
+        """Stream (employee_name, department, contact_phone) rows from the Employees table."""
+        query: str = "SELECT employee_name, department, contact_phone FROM Employees"
+        return self._iter_query(query, chunk_size)
+
+    def iter_documents(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, str, int]]:
+        """Stream (document_designation, document_name, document_quantity) rows from the Documents table."""
+        query: str = "SELECT document_designation, document_name, document_quantity FROM Documents"
+        return self._iter_query(query, chunk_size)
+
+    def iter_links(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, str, int]]:
+        """Stream (employee_name, document_designation, document_instance_number) rows from Employees_Documents."""
+        query: str = """
+            SELECT e.employee_name, d.document_designation, ed.document_instance_number
+            FROM Employees_Documents AS ed
+            JOIN Employees AS e ON e.employee_id = ed.employee_id
+            JOIN Documents AS d ON d.document_id = ed.document_id
+        """
+        return self._iter_query(query, chunk_size)
+
+    def iter_employee_documents(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple]:
+        """Stream the joined employee-document view, one row per link."""
+        query: str = """
+            SELECT e.employee_name, e.department, e.contact_phone,
+                   d.document_designation, d.document_name, d.document_quantity,
+                   ed.document_instance_number
+            FROM Employees_Documents AS ed
+            JOIN Employees AS e ON e.employee_id = ed.employee_id
+            JOIN Documents AS d ON d.document_id = ed.document_id
+        """
+        return self._iter_query(query, chunk_size)
+
+    def iter_query(
+        self, query: str, parameters: Tuple = (), chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Tuple]:
+        """Stream the rows of a read-only query, e.g. a report too large to hold in memory."""
+        return self._iter_query(query, chunk_size, parameters)
+
+    def _iter_query(self, query: str, chunk_size: int, parameters: Tuple = ()) -> Iterator[Tuple]:
+        """
+        Yield the rows of query fetched chunk_size at a time on a dedicated cursor.
+        Outside a session the generator holds its own reader until it is exhausted or closed.
+        """
+        current: Optional[Session] = getattr(self._local, "session", None)
+        if current is not None:
+            yield from self._fetch_in_chunks(current.connection, query, chunk_size, parameters)
+            return
+        with self._checkout(write=False, begin=self._readers is not None) as connection:
+            yield from self._fetch_in_chunks(connection, query, chunk_size, parameters)
+
+    def _fetch_in_chunks(
+        self, connection: sqlite3.Connection, query: str, chunk_size: int, parameters: Tuple = ()
+    ) -> Iterator[Tuple]:
+        """
+        Yield the rows of query. With instrumentation the statement is recorded once the cursor
+        is exhausted or closed, timing the fetches but not the consumer.
+        """
+        start: float = time.perf_counter()
+        cursor: sqlite3.Cursor = connection.execute(query, parameters)
+        elapsed: float = time.perf_counter() - start
+        count: int = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                rows: List[Tuple] = cursor.fetchmany(chunk_size)
+                elapsed += time.perf_counter() - start
+                if not rows:
+                    return
+                count += len(rows)
+                yield from rows
+        finally:
+            cursor.close()
+            if self.instrumentation is not None:
+                self.instrumentation.record_statement(connection, query, parameters, elapsed, count)
+
+    @instrumented
+    def backup(
+        self, target_path: str, pages: int = DEFAULT_BACKUP_PAGES, progress: Optional[BackupProgress] = None
+    ) -> None:
+        """
+        Copy the database to target_path with SQLite's online backup API, pages at a time.
+        The copy is a consistent snapshot that includes committed WAL contents.
+        """
+        # A dedicated source connection lets the backup run on any thread
+        source: sqlite3.Connection = (
+            self.connection if self.db_name == ":memory:" else sqlite3.connect(self.db_name)
+        )
+        target: sqlite3.Connection = sqlite3.connect(target_path)
+        try:
+            source.backup(target, pages=pages, progress=progress)
+        finally:
+            target.close()
+            if source is not self.connection:
+                source.close()
+
+    def backup_in_background(
+        self, target_path: str, pages: int = DEFAULT_BACKUP_PAGES, progress: Optional[BackupProgress] = None
+    ) -> "Future[str]":
+        """Run backup() on a separate thread; the returned future resolves to target_path."""
+        if self.db_name == ":memory:":
+            raise ValueError("An in-memory database can only be backed up on its own thread")
+        future: "Future[str]" = Future()
+
+        def run() -> None:
+            try:
+                self.backup(target_path, pages, progress)
+            except BaseException as error:
+                future.set_exception(error)
+            else:
+                future.set_result(target_path)
+
+        threading.Thread(target=run, name="database-backup").start()
+        return future
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Return a snapshot of the lookup cache figures and, with instrumentation enabled, the
+        method, statement and commit latency histograms (count, rows, total, mean, p50/p95/p99, max).
+        """
+        snapshot: Dict[str, object] = {"cache": self.cache.stats() if self.cache is not None else None}
+        if self.instrumentation is not None:
+            snapshot.update(self.instrumentation.snapshot())
+        return snapshot
 
     def close(self) -> None:
-        """Close the database connection."""
+        """
+        Close the database connection and every pooled reader. A reader still used by another
+        thread (e.g. an unfinished iter_* generator) is closed too; its next call fails.
+        """
+        for reader in self._reader_connections:
+            reader.close()
         self.connection.close()
@@ -0,0 +1,176 @@
+import bisect
+import functools
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# Upper bounds of the latency histogram buckets in milliseconds; the last bucket is unbounded
+BUCKET_BOUNDS_MS: Tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 10000.0,
+)
+
+# Statements that EXPLAIN QUERY PLAN can describe
+EXPLAINABLE: Tuple[str, ...] = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+WHITESPACE: "re.Pattern[str]" = re.compile(r"\s+")
+# "?, ?, ?" IN lists of any length are reported as one statement
+PLACEHOLDER_LIST: "re.Pattern[str]" = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_statement(query: str) -> str:
+    """Collapse whitespace and placeholder lists so that one statement has one key."""
+    return PLACEHOLDER_LIST.sub("?, ...", WHITESPACE.sub(" ", query).strip())
+
+
+class LatencyHistogram:
+    """Call count, total, maximum and bucketed latencies of one method or statement."""
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_ms: float = 0.0
+        self.max_ms: float = 0.0
+        self.rows: int = 0
+        self.buckets: List[int] = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, milliseconds: float, rows: int = 0) -> None:
+        self.count += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+        self.rows += rows
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, milliseconds)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of calls (capped by the maximum)."""
+        rank: float = fraction * self.count
+        seen: int = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKET_BOUNDS_MS[index], self.max_ms) if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "rows": self.rows,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class Instrumentation:
+    """
+    Latency histograms per DatabaseManager method and per SQL statement, plus commit counts.
+    Statements slower than slow_query_ms are logged with their EXPLAIN QUERY PLAN.
+    """
+
+    def __init__(self, slow_query_ms: Optional[float] = None) -> None:
+        self.slow_query_ms: Optional[float] = slow_query_ms
+        self.methods: Dict[str, LatencyHistogram] = {}
+        self.statements: Dict[str, LatencyHistogram] = {}
+        self.commits: LatencyHistogram = LatencyHistogram()
+        self.slow_queries: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def record_method(self, name: str, seconds: float, rows: int = 0) -> None:
+        with self._lock:
+            histogram: Optional[LatencyHistogram] = self.methods.get(name)
+            if histogram is None:
+                histogram = self.methods[name] = LatencyHistogram()
+            histogram.add(seconds * 1000, rows)
+
+    def record_statement(
+        self,
+        connection: sqlite3.Connection,
+        query: str,
+        parameters: Optional[Tuple],
+        seconds: float,
+        rows: int = 0,
+    ) -> None:
+        """
+        Record one statement execution. parameters is None for executemany, whose plan
+        cannot be explained for a single row.
+        """
+        milliseconds: float = seconds * 1000
+        key: str = normalize_statement(query)
+        with self._lock:
+            histogram: Optional[LatencyHistogram] = self.statements.get(key)
+            if histogram is None:
+                histogram = self.statements[key] = LatencyHistogram()
+            histogram.add(milliseconds, max(rows, 0))
+            slow: bool = self.slow_query_ms is not None and milliseconds >= self.slow_query_ms
+            if slow:
+                self.slow_queries += 1
+        if slow:
+            plan: List[str] = self._explain(connection, query, parameters)
+            logger.warning(
+                "Slow query (%.1f ms): %s | plan: %s",
+                milliseconds,
+                key,
+                "; ".join(plan) or "n/a",
+                extra={"event": "slow_query", "duration_ms": milliseconds, "statement": key, "plan": plan},
+            )
+
+    def record_commit(self, seconds: float) -> None:
+        with self._lock:
+            self.commits.add(seconds * 1000)
+
+    @staticmethod
+    def _explain(connection: sqlite3.Connection, query: str, parameters: Optional[Tuple]) -> List[str]:
+        if parameters is None or not query.lstrip().upper().startswith(EXPLAINABLE):
+            return []
+        try:
+            return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", parameters)]
+        except sqlite3.Error:
+            return []
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return a copy of the collected figures, safe to serialize as JSON."""
+        with self._lock:
+            return {
+                "methods": {name: histogram.snapshot() for name, histogram in sorted(self.methods.items())},
+                "statements": {query: histogram.snapshot() for query, histogram in sorted(self.statements.items())},
+                "commits": self.commits.snapshot(),
+                "slow_queries": self.slow_queries,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.methods.clear()
+            self.statements.clear()
+            self.commits = LatencyHistogram()
+            self.slow_queries = 0
+
+
+def instrumented(method: F) -> F:
+    """
+    Time a DatabaseManager method when the manager has instrumentation enabled; otherwise the
+    only cost is one attribute check. List results are counted as rows.
+    """
+    name: str = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation: Optional[Instrumentation] = self.instrumentation
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+        start: float = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        rows: int = len(result) if isinstance(result, list) else 0
+        instrumentation.record_method(name, time.perf_counter() - start, rows)
+        return result
+
+    return wrapper
@@ -1,6 +1,19 @@
+import os
 import sys
-import shutil
-
+from bisect import bisect_left
+
+from PyQt6.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QSettings,
+    QStringListModel,
+    Qt,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+)
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -11,19 +24,190 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QMessageBox,
     QComboBox,
+    QCompleter,
     QFileDialog,
 )
 from PyQt6.QtGui import QAction
 
-from database_manager import DatabaseManager
+from database_manager import DEFAULT_PAGE_SIZE, DatabaseManager
+
+
+class LazyListModel(QAbstractListModel):
+    """Отсортированный список строк, подгружаемый страницами в фоновом потоке"""
+
+    # Номер поколения модели и загруженная страница; сигнал испускается из фонового потока
+    page_loaded = pyqtSignal(int, list)
+
+    def __init__(self, parent=None, page_size=DEFAULT_PAGE_SIZE):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.fetch_page = None  # Функция (after, limit) -> список строк
+        self.items = []
+        self.exhausted = True
+        self.loading = False
+        # Увеличивается при каждом сбросе, чтобы отбрасывать страницы от прежнего источника
+        self.generation = 0
+        self.page_loaded.connect(self.on_page_loaded)
+
+    def reset(self, fetch_page=None):
+        """Сброс модели и загрузка первой страницы из нового источника"""
+        self.beginResetModel()
+        self.generation += 1
+        self.fetch_page = fetch_page
+        self.items = []
+        self.exhausted = fetch_page is None
+        self.loading = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.items[index.row()]
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent):
+        """Запрос следующей страницы в пуле потоков, не блокируя интерфейс"""
+        if parent.isValid() or self.exhausted or self.loading:
+            return
+        self.loading = True
+        generation = self.generation
+        fetch_page = self.fetch_page
+        after = self.items[-1] if self.items else None
+        page_size = self.page_size
+
+        def load():
+            try:
+                page = fetch_page(after, page_size)
+            except Exception:
+                page = []  # База данных закрыта во время загрузки
+            self.page_loaded.emit(generation, page)
+
+        QThreadPool.globalInstance().start(load)
+
+    def on_page_loaded(self, generation, page):
+        """Добавление загруженной страницы в конец списка (в потоке интерфейса)"""
+        if generation != self.generation:
+            return
+        self.loading = False
+        if len(page) < self.page_size:
+            self.exhausted = True
+        # Пропуск строк, уже вставленных через insert_item
+        if self.items:
+            page = [item for item in page if item > self.items[-1]]
+        if page:
+            first = len(self.items)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self.items.extend(page)
+            self.endInsertRows()
+
+    def insert_item(self, item):
+        """Вставка одной новой строки на её место без перезагрузки списка"""
+        position = bisect_left(self.items, item)
+        if position < len(self.items) and self.items[position] == item:
+            return
+        if position == len(self.items) and not self.exhausted:
+            return  # Строка попадёт в одну из следующих страниц
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.items.insert(position, item)
+        self.endInsertRows()
+
+
+class SearchCompleter(QCompleter):
+    """Подсказки при вводе, которые ищутся в базе данных после паузы в наборе"""
+
+    # Номер запроса и найденные строки; сигнал испускается из фонового потока
+    results_ready = pyqtSignal(int, list)
+
+    def __init__(self, line_edit, parent=None, delay=200, limit=20):
+        super().__init__(parent)
+        self.line_edit = line_edit
+        self.search = None  # Функция (prefix, limit) -> список строк
+        self.limit = limit
+        self.generation = 0
+        self.results = QStringListModel(self)
+        self.setModel(self.results)
+        # Строки уже отфильтрованы полнотекстовым поиском
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+
+        # Поиск запускается только после паузы в наборе
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.start_search)
+        line_edit.textEdited.connect(lambda _: self.timer.start())
+        self.results_ready.connect(self.on_results_ready)
+
+    def set_search(self, search=None):
+        """Смена функции поиска при открытии или закрытии базы данных"""
+        self.search = search
+        self.generation += 1
+        self.results.setStringList([])
+
+    def start_search(self):
+        """Поиск по введённому тексту в пуле потоков"""
+        self.generation += 1
+        generation = self.generation
+        search = self.search
+        prefix = self.line_edit.text().strip()
+        if search is None or not prefix:
+            self.results.setStringList([])
+            return
+        limit = self.limit
+
+        def run():
+            try:
+                results = search(prefix, limit)
+            except Exception:
+                results = []  # База данных закрыта во время поиска
+            self.results_ready.emit(generation, results)
+
+        QThreadPool.globalInstance().start(run)
+
+    def on_results_ready(self, generation, results):
+        """Показ подсказок, если за время поиска текст не изменился"""
+        if generation != self.generation:
+            return
+        self.results.setStringList(results)
+        if results and self.line_edit.hasFocus():
+            self.complete()
+
+
+# Аргумент командной строки для замера времени запуска (benchmark.py startup)
+FIRST_PAINT_FLAG = "--exit-after-first-paint"
+
+
+class FirstPaintProbe(QObject):
+    """Завершение приложения при первой отрисовке окна"""
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            QTimer.singleShot(0, QApplication.instance().quit)
+        return False
 
 
 class MainWindow(QMainWindow):
+    # Открытая в фоне база данных (номер открытия, менеджер или None, путь, текст ошибки)
+    database_opened = pyqtSignal(int, object, str, str)
+    # Ход резервного копирования (скопировано страниц, всего страниц); сигнал из фонового потока
+    backup_progress = pyqtSignal(int, int)
+    # Завершение резервного копирования (путь, текст ошибки или пустая строка)
+    backup_finished = pyqtSignal(str, str)
+
     def __init__(self):
         super().__init__()
         
         self.db_manager = None  # Инициализация переменной базы данных
         self.current_db_path = None  # Для хранения пути к текущей базе данных
+        # Увеличивается при каждой смене базы, чтобы отбрасывать устаревшее фоновое открытие
+        self.open_generation = 0
+        self.settings = QSettings("EmployeeDocuments", "interface_manager")
+        self.database_opened.connect(self.on_database_opened)
         self.setWindowTitle("Управление сотрудниками и документами")
         
         # Создание меню
@@ -43,9 +227,11 @@ class MainWindow(QMainWindow):
         close_db_action.triggered.connect(self.close_database)
         file_menu.addAction(close_db_action)
 
-        backup_db_action = QAction("Создать резервную копию", self)
-        backup_db_action.triggered.connect(self.backup_database)
-        file_menu.addAction(backup_db_action)
+        self.backup_db_action = QAction("Создать резервную копию", self)
+        self.backup_db_action.triggered.connect(self.backup_database)
+        file_menu.addAction(self.backup_db_action)
+        self.backup_progress.connect(self.on_backup_progress)
+        self.backup_finished.connect(self.on_backup_finished)
         
         # Основной виджет и макет
         layout = QVBoxLayout()
@@ -82,9 +268,24 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.quantity_input)
         layout.addWidget(self.add_document_button)
 
-        # Выпадающие списки для выбора сотрудника и документа
+        # Выпадающие списки для выбора сотрудника и документа, подгружаемые страницами
+        self.employee_model = LazyListModel(self)
+        self.document_model = LazyListModel(self)
         self.employee_combo = QComboBox(self)
+        self.employee_combo.setModel(self.employee_model)
         self.document_combo = QComboBox(self)
+        self.document_combo.setModel(self.document_model)
+
+        # Выбор вводом текста с подсказками из полнотекстового поиска
+        for combo in (self.employee_combo, self.document_combo):
+            combo.setEditable(True)
+            combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.employee_combo.lineEdit().setPlaceholderText("Начните вводить имя, отдел или телефон")
+        self.document_combo.lineEdit().setPlaceholderText("Начните вводить обозначение или название")
+        self.employee_completer = SearchCompleter(self.employee_combo.lineEdit(), self)
+        self.employee_combo.setCompleter(self.employee_completer)
+        self.document_completer = SearchCompleter(self.document_combo.lineEdit(), self)
+        self.document_combo.setCompleter(self.document_completer)
 
         # Поле для ввода номера экземпляра документа
         self.document_instance_input = QLineEdit(self)
@@ -104,18 +305,15 @@ class MainWindow(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
-        # Первоначальное обновление списков сотрудников и документов
-        self.refresh_employee_and_document_lists()
+        # Списки пусты, пока не открыта база данных: конструктор не обращается к базе,
+        # чтобы окно появлялось сразу; последняя база открывается в open_last_database
 
     def create_new_database(self):
         """Создание новой базы данных"""
         file_path, _ = QFileDialog.getSaveFileName(self, "Создать новую базу данных", "", "SQLite Files (*.db);;All Files (*)")
         if file_path:
-            if self.db_manager:
-                self.db_manager.close()
-            self.db_manager = DatabaseManager(file_path)
+            self.set_database(connect_database(file_path), file_path)
             self.db_manager.create_tables()
-            self.current_db_path = file_path
             QMessageBox.information(self, "Успех", "Новая база данных создана!")
             self.refresh_employee_and_document_lists()
 
@@ -123,22 +321,59 @@ class MainWindow(QMainWindow):
         """Открытие существующей базы данных"""
         file_path, _ = QFileDialog.getOpenFileName(self, "Открыть базу данных", "", "SQLite Files (*.db);;All Files (*)")
         if file_path:
-            if self.db_manager:
-                self.db_manager.close()
-            self.db_manager = DatabaseManager(file_path)
-            self.current_db_path = file_path
+            self.set_database(connect_database(file_path), file_path)
             QMessageBox.information(self, "Успех", "База данных открыта!")
             self.refresh_employee_and_document_lists()
 
     def close_database(self):
         """Закрытие текущей базы данных"""
         if self.db_manager:
-            self.db_manager.close()
-            self.db_manager = None
-            self.current_db_path = None
+            self.set_database(None, None)
             QMessageBox.information(self, "Успех", "База данных закрыта!")
             self.clear_lists_and_fields()
 
+    def set_database(self, db_manager, file_path):
+        """Замена текущей базы данных; путь запоминается для следующего запуска"""
+        self.open_generation += 1
+        if self.db_manager:
+            self.db_manager.close()
+        self.db_manager = db_manager
+        self.current_db_path = file_path
+        if file_path:
+            self.settings.setValue("last_database", file_path)
+        else:
+            self.settings.remove("last_database")
+
+    def open_last_database(self):
+        """Открытие последней использованной базы данных в фоне после показа окна"""
+        file_path = self.settings.value("last_database")
+        if not file_path or not os.path.exists(file_path):
+            return
+        self.statusBar().showMessage(f"Открытие базы данных {file_path}...")
+        generation = self.open_generation
+
+        def run():
+            # Миграция схемы старого файла может занять заметное время
+            try:
+                self.database_opened.emit(generation, connect_database(file_path), file_path, "")
+            except Exception as e:
+                self.database_opened.emit(generation, None, file_path, str(e))
+
+        QThreadPool.globalInstance().start(run)
+
+    def on_database_opened(self, generation, db_manager, file_path, error):
+        """Подключение открытой в фоне базы, если пользователь не открыл другую"""
+        self.statusBar().clearMessage()
+        if generation != self.open_generation:
+            if db_manager:
+                db_manager.close()
+            return
+        if error:
+            self.statusBar().showMessage(f"Не удалось открыть базу данных {file_path}: {error}", 10000)
+            return
+        self.set_database(db_manager, file_path)
+        self.refresh_employee_and_document_lists()
+
     def backup_database(self):
         """Создание резервной копии текущей базы данных"""
         if not self.current_db_path:
@@ -147,16 +382,47 @@ class MainWindow(QMainWindow):
 
         backup_path, _ = QFileDialog.getSaveFileName(self, "Создать резервную копию", "", "SQLite Files (*.db);;All Files (*)")
         if backup_path:
+            # Постраничное онлайн-копирование в фоне: интерфейс не блокируется, а копия согласована
             try:
-                shutil.copyfile(self.current_db_path, backup_path)
-                QMessageBox.information(self, "Успех", f"Резервная копия базы данных создана по пути: {backup_path}")
+                future = self.db_manager.backup_in_background(
+                    backup_path, progress=lambda status, remaining, total: self.backup_progress.emit(total - remaining, total)
+                )
             except Exception as e:
                 QMessageBox.warning(self, "Ошибка", f"Не удалось создать резервную копию: {e}")
+                return
+            self.backup_db_action.setEnabled(False)
+            future.add_done_callback(lambda done: self.verify_backup(done, backup_path))
+
+    def verify_backup(self, future, backup_path):
+        """Проверка целостности готовой копии (в потоке резервного копирования)"""
+        # Модуль резервного копирования нужен только здесь и не загружается при запуске
+        from backup_manager import integrity_check
+
+        try:
+            future.result()
+            result = integrity_check(backup_path)
+            error = "" if result == ["ok"] else "; ".join(result)
+        except Exception as e:
+            error = str(e)
+        self.backup_finished.emit(backup_path, error)
+
+    def on_backup_progress(self, copied, total):
+        self.statusBar().showMessage(f"Резервное копирование: {copied} из {total} страниц")
+
+    def on_backup_finished(self, backup_path, error):
+        self.backup_db_action.setEnabled(True)
+        self.statusBar().clearMessage()
+        if error:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось создать резервную копию: {error}")
+        else:
+            QMessageBox.information(self, "Успех", f"Резервная копия базы данных создана по пути: {backup_path}")
 
     def clear_lists_and_fields(self):
         """Очистка всех полей ввода и выпадающих списков"""
-        self.employee_combo.clear()
-        self.document_combo.clear()
+        self.employee_model.reset()
+        self.document_model.reset()
+        self.employee_completer.set_search()
+        self.document_completer.set_search()
         
         # Очистка всех полей ввода
         self.employee_name_input.clear()
@@ -180,7 +446,7 @@ class MainWindow(QMainWindow):
             try:
                 self.db_manager.insert_employee(name, department, phone)
                 QMessageBox.information(self, "Успех", "Сотрудник добавлен!")
-                self.refresh_employee_and_document_lists()
+                self.employee_model.insert_item(name)
             except Exception as e:
                 QMessageBox.warning(self, "Ошибка", f"Не удалось добавить сотрудника: {e}")
         else:
@@ -199,7 +465,7 @@ class MainWindow(QMainWindow):
             try:
                 self.db_manager.insert_document(designation, name, int(quantity))
                 QMessageBox.information(self, "Успех", "Документ добавлен!")
-                self.refresh_employee_and_document_lists()
+                self.document_model.insert_item(designation)
             except Exception as e:
                 QMessageBox.warning(self, "Ошибка", f"Не удалось добавить документ: {e}")
         else:
@@ -219,7 +485,6 @@ class MainWindow(QMainWindow):
             try:
                 self.db_manager.link_employee_to_document(employee, document, int(instance_number))
                 QMessageBox.information(self, "Успех", "Сотрудник и документ связаны!")
-                self.refresh_employee_and_document_lists()
             except Exception as e:
                 QMessageBox.warning(self, "Ошибка", f"Не удалось связать сотрудника и документ: {e}")
         else:
@@ -231,23 +496,32 @@ class MainWindow(QMainWindow):
             self.clear_lists_and_fields()
             return
 
-        self.employee_combo.clear()
-        self.document_combo.clear()
-
-        employees = self.db_manager.get_all_employees()
-        documents = self.db_manager.get_all_documents()
-
-        self.employee_combo.addItems(employees)
-        self.document_combo.addItems(documents)
+        # Первые страницы загружаются в фоне, остальные - при прокрутке списка
+        self.employee_model.reset(self.db_manager.get_employees_page)
+        self.document_model.reset(self.db_manager.get_documents_page)
+        self.employee_completer.set_search(self.db_manager.search_employees)
+        self.document_completer.set_search(self.db_manager.search_documents)
 
     def closeEvent(self, event):
+        self.open_generation += 1
         if self.db_manager:
             self.db_manager.close()
         event.accept()
 
 
+def connect_database(file_path):
+    """Открытие базы данных с пулом читателей для фоновой подгрузки списков"""
+    return DatabaseManager(file_path, pool_size=2, cache_size=1024, cache_ttl=30)
+
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
+    if FIRST_PAINT_FLAG in sys.argv:
+        probe = FirstPaintProbe(window)
+        window.installEventFilter(probe)
+    else:
+        # Работа с базой данных начинается только после показа окна
+        QTimer.singleShot(0, window.open_last_database)
     window.show()
     sys.exit(app.exec())
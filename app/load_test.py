@@ -0,0 +1,125 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import quote, urlsplit
+
+from database_manager import DatabaseManager
+from service import make_server
+from test_data_generator import document_designation, employee_name, generate_test_data
+
+
+def request_paths(employee_count: int, document_count: int, count: int, seed: int) -> List[str]:
+    """
+    A read-heavy request mix: mostly link lookups with Zipf-like hot keys, plus pages and searches.
+    """
+    generator: random.Random = random.Random(seed)
+    paths: List[str] = []
+    for _ in range(count):
+        kind: float = generator.random()
+        if kind < 0.4:
+            # Popular documents are requested far more often than the rest
+            document: int = min(int(generator.paretovariate(1.2)), document_count)
+            paths.append(f"/documents/{quote(document_designation(document))}/employees")
+        elif kind < 0.8:
+            employee: int = generator.randint(1, employee_count)
+            paths.append(f"/employees/{quote(employee_name(employee))}/documents")
+        elif kind < 0.9:
+            paths.append(f"/employees?after={quote(employee_name(generator.randint(1, employee_count)))}&limit=100")
+        else:
+            paths.append(f"/search/employees?q={generator.randint(1, employee_count)}")
+    return paths
+
+
+def run_load(url: str, paths: List[str], threads: int) -> Dict[str, float]:
+    """Replay paths over keep-alive connections from several threads; returns latency figures in ms."""
+    address = urlsplit(url)
+    chunks: List[List[str]] = [paths[index::threads] for index in range(threads)]
+    latencies: List[float] = []
+    errors: List[int] = []
+    lock: threading.Lock = threading.Lock()
+
+    def worker(chunk: List[str]) -> None:
+        connection = http.client.HTTPConnection(address.hostname, address.port or 80)
+        measured: List[float] = []
+        failed: int = 0
+        for path in chunk:
+            start: float = time.perf_counter()
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            measured.append((time.perf_counter() - start) * 1000)
+            failed += response.status >= 400
+        connection.close()
+        with lock:
+            latencies.extend(measured)
+            errors.append(failed)
+
+    workers: List[threading.Thread] = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start: float = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed: float = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[int(len(latencies) * 0.99)],
+        "max_ms": latencies[-1],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the HTTP/JSON service and report latency percentiles.")
+    parser.add_argument("--url", help="running service to test; by default a local instance is started")
+    parser.add_argument("--employees", type=int, default=100_000, help="employees generated for a local instance")
+    parser.add_argument("--documents", type=int, default=10_000, help="documents generated for a local instance")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments: argparse.Namespace = parser.parse_args(argv)
+
+    paths: List[str] = request_paths(arguments.employees, arguments.documents, arguments.requests, arguments.seed)
+    if arguments.url is not None:
+        results: Dict[str, float] = run_load(arguments.url, paths, arguments.threads)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            db_path: str = os.path.join(directory, "service.db")
+            loader: DatabaseManager = DatabaseManager(db_path, profile="bulk")
+            loader.create_tables()
+            generate_test_data(loader, arguments.employees, arguments.documents, seed=arguments.seed)
+            loader.close()
+
+            db: DatabaseManager = DatabaseManager(
+                db_path, pool_size=arguments.pool_size, cache_size=arguments.cache_size, cache_ttl=5.0
+            )
+            server = make_server(db, port=0)
+            thread: threading.Thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                results = run_load(f"http://127.0.0.1:{server.server_address[1]}", paths, arguments.threads)
+                results["coalesced_requests"] = server.service.coalescer.coalesced
+            finally:
+                server.shutdown()
+                server.server_close()
+                db.close()
+
+    print(json.dumps(results, indent=2))
+    return 1 if results["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+from typing import TYPE_CHECKING, Callable, ContextManager, NamedTuple, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from database_manager import Session
+
+
+# Rows rewritten per transaction by a batched step
+DEFAULT_BATCH_SIZE: int = 20_000
+
+# Position of the migration in progress; the table only exists while a migration runs
+PROGRESS_TABLE: str = "Schema_Migration_Progress"
+
+
+class BatchedStep(NamedTuple):
+    """
+    Run queries over the rows of source in rowid order, one batch per transaction.
+    Every query receives the rowid range of the batch as ?1 (exclusive) and ?2 (inclusive).
+    """
+
+    source: str
+    queries: Tuple[str, ...]
+
+
+Step = Union[str, Callable[["Session"], None], BatchedStep]
+
+
+class Migration(NamedTuple):
+    """
+    Steps that bring a file from version - 1 to version. A plain SQL string or callable step
+    runs in one transaction; `needed` can tell that a file already has the change.
+    """
+
+    version: int
+    description: str
+    steps: Tuple[Step, ...]
+    needed: Optional[Callable[["Session"], bool]] = None
+
+
+MigrationProgress = Callable[[Migration, int, int], None]
+
+
+def schema_version(session: "Session") -> int:
+    return session.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(
+    open_session: Callable[[], ContextManager["Session"]],
+    migrations: Sequence[Migration],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Optional[MigrationProgress] = None,
+) -> int:
+    """
+    Apply the migrations newer than PRAGMA user_version in order and return the final version.
+    Work is committed step by step (and batch by batch), with the position recorded in the
+    same transaction, so an interrupted migration resumes where it stopped on the next run.
+    progress(migration, step, position) is called after every committed unit of work.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    while True:
+        with open_session() as session:
+            unit: Optional[Tuple[Migration, int, int]] = _run_unit(session, migrations, batch_size)
+            if unit is None:
+                return schema_version(session)
+        if progress is not None:
+            progress(*unit)
+
+
+def _run_unit(
+    session: "Session", migrations: Sequence[Migration], batch_size: int
+) -> Optional[Tuple[Migration, int, int]]:
+    """Run one step or batch of the oldest pending migration; returns None if none is pending."""
+    version: int = schema_version(session)
+    pending: Sequence[Migration] = [migration for migration in migrations if migration.version > version]
+    if not pending:
+        return None
+    migration: Migration = pending[0]
+
+    session.execute(
+        f"CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} "
+        "(version INTEGER PRIMARY KEY, step INTEGER NOT NULL, position INTEGER NOT NULL)"
+    )
+    query: str = f"SELECT step, position FROM {PROGRESS_TABLE} WHERE version = ?"
+    row: Optional[Tuple[int, int]] = session.execute(query, (migration.version,)).fetchone()
+    if row is not None:
+        step, position = row
+    elif migration.needed is None or migration.needed(session):
+        step, position = 0, 0
+    else:
+        step, position = len(migration.steps), 0
+
+    if step >= len(migration.steps):
+        session.execute(f"DROP TABLE {PROGRESS_TABLE}")
+        session.execute(f"PRAGMA user_version = {int(migration.version)}")
+        return migration, step, position
+
+    current: Step = migration.steps[step]
+    if isinstance(current, BatchedStep):
+        query = (
+            "SELECT MAX(rowid) FROM ("
+            f"SELECT rowid FROM {current.source} WHERE rowid > ? ORDER BY rowid LIMIT ?)"
+        )
+        end: Optional[int] = session.execute(query, (position, batch_size)).fetchone()[0]
+        if end is None:
+            step, position = step + 1, 0
+        else:
+            for batch_query in current.queries:
+                session.execute(batch_query, (position, end))
+            position = end
+    else:
+        if isinstance(current, str):
+            session.execute(current)
+        else:
+            current(session)
+        step += 1
+
+    query = f"INSERT OR REPLACE INTO {PROGRESS_TABLE} (version, step, position) VALUES (?, ?, ?)"
+    session.execute(query, (migration.version, step, position))
+    return migration, step, position
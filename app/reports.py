@@ -0,0 +1,151 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Sequence, TextIO, Tuple
+
+from database_manager import DEFAULT_CHUNK_SIZE, DatabaseManager
+
+
+class DocumentAllocation(NamedTuple):
+    document_designation: str
+    document_name: str
+    document_quantity: int
+    issued: int
+    # Negative when more copies are issued than exist
+    available: int
+
+
+class DepartmentHolding(NamedTuple):
+    department: str
+    document_designation: str
+    holders: int
+
+
+class InstanceCollision(NamedTuple):
+    document_designation: str
+    document_instance_number: int
+    employee_names: Tuple[str, ...]
+
+
+# Copies issued per document, counted on the link index before joining the documents
+ALLOCATION_QUERY: str = """
+    SELECT d.document_designation, d.document_name, d.document_quantity,
+           IFNULL(ed.issued, 0), d.document_quantity - IFNULL(ed.issued, 0)
+    FROM Documents AS d
+    LEFT JOIN (
+        SELECT document_id, COUNT(*) AS issued FROM Employees_Documents GROUP BY document_id
+    ) AS ed ON ed.document_id = d.document_id
+    {where}
+    ORDER BY d.document_designation
+"""
+DEPARTMENT_HOLDINGS_QUERY: str = """
+    SELECT e.department, d.document_designation, COUNT(*)
+    FROM Employees_Documents AS ed
+    JOIN Employees AS e ON e.employee_id = ed.employee_id
+    JOIN Documents AS d ON d.document_id = ed.document_id
+    GROUP BY e.department, ed.document_id
+    ORDER BY e.department, d.document_designation
+"""
+INSTANCE_COLLISIONS_QUERY: str = """
+    SELECT d.document_designation, ed.document_instance_number, json_group_array(e.employee_name)
+    FROM Employees_Documents AS ed
+    JOIN Employees AS e ON e.employee_id = ed.employee_id
+    JOIN Documents AS d ON d.document_id = ed.document_id
+    GROUP BY ed.document_id, ed.document_instance_number
+    HAVING COUNT(*) > 1
+    ORDER BY d.document_designation, ed.document_instance_number
+"""
+
+
+def document_allocation(
+    db: DatabaseManager, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[DocumentAllocation]:
+    """Stream issued copies against document_quantity for every document."""
+    query: str = ALLOCATION_QUERY.format(where="")
+    return map(DocumentAllocation._make, db.iter_query(query, chunk_size=chunk_size))
+
+
+def over_allocated_documents(
+    db: DatabaseManager, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[DocumentAllocation]:
+    """Stream the documents with more copies issued than document_quantity."""
+    query: str = ALLOCATION_QUERY.format(where="WHERE ed.issued > d.document_quantity")
+    return map(DocumentAllocation._make, db.iter_query(query, chunk_size=chunk_size))
+
+
+def department_holdings(
+    db: DatabaseManager, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[DepartmentHolding]:
+    """Stream the number of employees of each department holding each document."""
+    return map(DepartmentHolding._make, db.iter_query(DEPARTMENT_HOLDINGS_QUERY, chunk_size=chunk_size))
+
+
+def instance_collisions(
+    db: DatabaseManager, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[InstanceCollision]:
+    """Stream the instance numbers of a document that are issued to more than one employee."""
+    rows: Iterator[Tuple[str, int, str]] = db.iter_query(INSTANCE_COLLISIONS_QUERY, chunk_size=chunk_size)
+    for designation, instance_number, names in rows:
+        yield InstanceCollision(designation, instance_number, tuple(sorted(json.loads(names))))
+
+
+REPORTS: Dict[str, Tuple[Callable[[DatabaseManager, int], Iterator[Tuple]], Tuple[str, ...]]] = {
+    "allocation": (document_allocation, DocumentAllocation._fields),
+    "over-allocated": (over_allocated_documents, DocumentAllocation._fields),
+    "departments": (department_holdings, DepartmentHolding._fields),
+    "collisions": (instance_collisions, InstanceCollision._fields),
+}
+
+
+def write_report(
+    db: DatabaseManager, report: str, output: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """Write a report as CSV and return the number of rows written."""
+    run, columns = REPORTS[report]
+    writer = csv.writer(output)
+    writer.writerow(columns)
+    count: int = 0
+    for row in run(db, chunk_size):
+        # Multi-valued columns are joined with "; " to keep one row per record
+        writer.writerow(["; ".join(value) if isinstance(value, tuple) else value for value in row])
+        count += 1
+    return count
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print document allocation reports as CSV.")
+    parser.add_argument("report", choices=tuple(REPORTS))
+    parser.add_argument("--db", default="database.db", help="SQLite database file")
+    parser.add_argument("--output", help="CSV file to write (standard output by default)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    arguments: argparse.Namespace = parser.parse_args(argv)
+
+    # Opening a missing path would create an empty database instead of reporting the mistake
+    if not os.path.isfile(arguments.db):
+        print(f"Error: database file not found: {arguments.db}", file=sys.stderr)
+        return 1
+    try:
+        db: DatabaseManager = DatabaseManager(arguments.db)
+    except sqlite3.Error as error:
+        print(f"Error: cannot open {arguments.db}: {error}", file=sys.stderr)
+        return 1
+    try:
+        if arguments.output is None:
+            write_report(db, arguments.report, sys.stdout, arguments.chunk_size)
+        else:
+            with open(arguments.output, "w", newline="", encoding="utf-8") as stream:
+                count: int = write_report(db, arguments.report, stream, arguments.chunk_size)
+            print(f"Wrote {count} rows to {arguments.output}")
+    except sqlite3.Error as error:
+        print(f"Error: {arguments.db} is not a document database: {error}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+import argparse
+import hashlib
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from data_transfer import validate_rows
+from database_manager import DEFAULT_PAGE_SIZE, DEFAULT_SEARCH_LIMIT, PROFILES, BulkResult, DatabaseManager
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upper bound on the limit parameter of list and search endpoints
+MAX_PAGE_SIZE: int = 1_000
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status: int = status
+
+
+class Response(NamedTuple):
+    status: int
+    body: object
+    # GET responses that clients may revalidate with If-None-Match
+    cacheable: bool = False
+
+
+class RequestCoalescer:
+    """
+    Share one in-flight call among concurrent identical requests: the first caller runs it,
+    later callers with the same key wait for its result instead of querying again.
+    forget() stops later callers from joining the calls already in flight.
+    """
+
+    def __init__(self) -> None:
+        self._lock: threading.Lock = threading.Lock()
+        self._calls: Dict[Hashable, "Future[object]"] = {}
+        self.coalesced: int = 0
+
+    def run(self, key: Hashable, function: Callable[[], T]) -> T:
+        with self._lock:
+            future: Optional["Future[object]"] = self._calls.get(key)
+            leader: bool = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result: T = function()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    def forget(self) -> None:
+        """Let later calls start afresh, e.g. after a write their results must reflect."""
+        with self._lock:
+            self._calls.clear()
+
+
+def _parameter(parameters: Dict[str, List[str]], name: str, default: Optional[str] = None) -> Optional[str]:
+    values: Optional[List[str]] = parameters.get(name)
+    return values[0] if values else default
+
+
+def _limit(parameters: Dict[str, List[str]], default: int) -> int:
+    try:
+        limit: int = int(_parameter(parameters, "limit", str(default)))
+    except ValueError:
+        raise HTTPError(400, "limit must be an integer") from None
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPError(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+class DatabaseService:
+    """
+    JSON operations on a DatabaseManager, independent of the HTTP transport:
+
+        GET  /employees?after=&limit=             page of employee names (keyset pagination)
+        GET  /documents?after=&limit=             page of document designations
+        GET  /employees/{name}/documents          documents linked to an employee
+        GET  /documents/{designation}/employees   employees linked to a document
+        GET  /search/employees?q=&limit=          type-ahead search
+        GET  /search/documents?q=&limit=
+        GET  /stats                               DatabaseManager.stats() and coalescing figures
+        POST /employees, /documents, /links       one JSON object or a list of them
+    """
+
+    def __init__(self, db: DatabaseManager) -> None:
+        self.db: DatabaseManager = db
+        self.coalescer: RequestCoalescer = RequestCoalescer()
+
+    def handle(self, method: str, target: str, body: bytes = b"") -> Response:
+        """Dispatch a request; errors are returned as {"error": message} responses."""
+        try:
+            url = urlsplit(target)
+            segments: List[str] = [unquote(segment) for segment in url.path.split("/") if segment]
+            parameters: Dict[str, List[str]] = parse_qs(url.query)
+            if method == "GET":
+                return self._get(segments, parameters)
+            if method == "POST":
+                return self._post(segments, body)
+            raise HTTPError(405, f"Method {method} is not allowed")
+        except HTTPError as error:
+            return Response(error.status, {"error": str(error)})
+        except Exception:
+            logger.exception("Request %s %s failed", method, target)
+            return Response(500, {"error": "Internal server error"})
+
+    def _get(self, segments: List[str], parameters: Dict[str, List[str]]) -> Response:
+        if segments in (["employees"], ["documents"]):
+            limit: int = _limit(parameters, DEFAULT_PAGE_SIZE)
+            after: Optional[str] = _parameter(parameters, "after")
+            fetch_page: Callable[[Optional[str], int], List[str]] = (
+                self.db.get_employees_page if segments[0] == "employees" else self.db.get_documents_page
+            )
+            items: List[str] = fetch_page(after, limit)
+            return Response(200, {"items": items, "next": items[-1] if len(items) == limit else None}, True)
+
+        if len(segments) == 3:
+            lookups: Dict[Tuple[str, str], Callable[[str], List[str]]] = {
+                ("employees", "documents"): self.db.get_documents_by_employee,
+                ("documents", "employees"): self.db.get_employees_by_document,
+            }
+            lookup: Optional[Callable[[str], List[str]]] = lookups.get((segments[0], segments[2]))
+            if lookup is not None:
+                key: Tuple[str, ...] = tuple(segments)
+                return Response(200, {"items": self.coalescer.run(key, lambda: lookup(segments[1]))}, True)
+
+        if len(segments) == 2 and segments[0] == "search" and segments[1] in ("employees", "documents"):
+            query: str = _parameter(parameters, "q", "")
+            limit = _limit(parameters, DEFAULT_SEARCH_LIMIT)
+            search: Callable[[str, int], List[str]] = (
+                self.db.search_employees if segments[1] == "employees" else self.db.search_documents
+            )
+            items = self.coalescer.run(("search", segments[1], query, limit), lambda: search(query, limit))
+            return Response(200, {"items": items}, True)
+
+        if segments == ["stats"]:
+            return Response(200, {**self.db.stats(), "coalesced_requests": self.coalescer.coalesced})
+        raise HTTPError(404, "Not found")
+
+    def _post(self, segments: List[str], body: bytes) -> Response:
+        writers: Dict[str, Callable[[List[Tuple]], BulkResult]] = {
+            "employees": self.db.insert_employees_bulk,
+            "documents": self.db.insert_documents_bulk,
+            "links": self.db.link_bulk,
+        }
+        if len(segments) != 1 or segments[0] not in writers:
+            raise HTTPError(404, "Not found")
+        try:
+            payload: object = json.loads(body or b"null")
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON") from None
+        records: object = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(record, dict) for record in records):
+            raise HTTPError(400, "Expected a JSON object or a list of objects")
+        try:
+            rows: List[Tuple] = list(validate_rows(records, segments[0]))
+        except ValueError as error:
+            raise HTTPError(400, str(error)) from None
+        # Links to unknown employees or documents are counted as skipped
+        try:
+            result: BulkResult = writers[segments[0]](rows)
+        finally:
+            # Lookups that started before the commit must not answer requests sent after it
+            self.coalescer.forget()
+        return Response(201 if result.inserted else 200, result._asdict())
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive between requests
+    protocol_version: str = "HTTP/1.1"
+    server_version: str = "DatabaseService"
+    # Headers and body are separate writes; with Nagle's algorithm the body waits for a delayed ACK
+    disable_nagle_algorithm: bool = True
+
+    def do_GET(self) -> None:
+        self._respond(self.server.service.handle("GET", self.path))
+
+    def do_POST(self) -> None:
+        length: int = int(self.headers.get("Content-Length") or 0)
+        self._respond(self.server.service.handle("POST", self.path, self.rfile.read(length)))
+
+    def _respond(self, response: Response) -> None:
+        body: bytes = json.dumps(response.body, ensure_ascii=False).encode("utf-8")
+        etag: Optional[str] = None
+        if response.cacheable and response.status == 200:
+            etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+            if etag in (self.headers.get("If-None-Match") or ""):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+
+def make_server(db: DatabaseManager, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    """Create a threaded HTTP server for db; the manager must be pooled (pool_size > 0)."""
+    if not db.pool_size:
+        raise ValueError("The service handles requests on many threads and needs a pooled DatabaseManager")
+    server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.daemon_threads = True
+    server.service = DatabaseService(db)
+    return server
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a database over HTTP/JSON.")
+    parser.add_argument("--db", default="database.db", help="SQLite database file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--profile", choices=tuple(PROFILES), default="durable", help="connection tuning profile")
+    parser.add_argument("--pool-size", type=int, default=4, help="reader connections")
+    parser.add_argument("--cache-size", type=int, default=4096, help="lookup cache entries")
+    parser.add_argument("--cache-ttl", type=float, default=5.0, help="seconds before cached lookups expire")
+    arguments: argparse.Namespace = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    db: DatabaseManager = DatabaseManager(
+        arguments.db,
+        arguments.profile,
+        pool_size=max(arguments.pool_size, 1),
+        cache_size=arguments.cache_size,
+        cache_ttl=arguments.cache_ttl,
+    )
+    db.create_tables()
+    server: ThreadingHTTPServer = make_server(db, arguments.host, arguments.port)
+    logger.info("Serving %s on http://%s:%d", arguments.db, arguments.host, server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
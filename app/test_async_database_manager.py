@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import pytest
+
+import async_database_manager
+from async_database_manager import AsyncDatabaseManager
+
+
+def test_concurrent_writes_share_one_commit():
+    async def scenario():
+        async with AsyncDatabaseManager(":memory:") as db_manager:
+            await db_manager.create_tables()
+            await asyncio.gather(
+                *(db_manager.insert_employee(f"Employee {i}", "IT", str(i)) for i in range(50)),
+                db_manager.insert_document("DOC001", "Handbook", 10),
+            )
+            assert db_manager.group_commits == 1
+
+            await db_manager.link_employee_to_document("Employee 1", "DOC001", 1)
+            assert await db_manager.get_employees_by_document("DOC001") == ["Employee 1"]
+            assert len(await db_manager.get_all_employees()) == 50
+
+    asyncio.run(scenario())
+
+
+def test_failed_write_does_not_roll_back_its_group():
+    async def scenario():
+        async with AsyncDatabaseManager(":memory:") as db_manager:
+            await db_manager.create_tables()
+            results = await asyncio.gather(
+                db_manager.insert_employee("John Doe", "HR", "1"),
+                db_manager.insert_employee("Jane Smith", None, "2"),
+                db_manager.insert_employee("Max Mustermann", "IT", "3"),
+                return_exceptions=True,
+            )
+            assert results[0] is None and results[2] is None
+            assert isinstance(results[1], Exception)
+            assert sorted(await db_manager.get_all_employees()) == ["John Doe", "Max Mustermann"]
+
+    asyncio.run(scenario())
+
+
+def test_async_iteration_streams_in_chunks():
+    async def scenario():
+        async with AsyncDatabaseManager(":memory:") as db_manager:
+            await db_manager.create_tables()
+            await db_manager.insert_employees_bulk((f"Employee {i}", "IT", str(i)) for i in range(25))
+            names = [row[0] async for row in db_manager.iter_employees(chunk_size=4)]
+            assert sorted(names) == sorted(f"Employee {i}" for i in range(25))
+
+            async for _ in db_manager.iter_employees(chunk_size=4):
+                break
+            assert len(await db_manager.get_all_employees()) == 25
+
+    asyncio.run(scenario())
+
+
+def test_cache_and_instrumentation_options_reach_the_manager():
+    async def scenario():
+        async with AsyncDatabaseManager(":memory:", cache_size=8, instrument=True) as db_manager:
+            await db_manager.create_tables()
+            await db_manager.insert_employee("John Doe", "HR", "1")
+            for _ in range(2):
+                assert await db_manager.get_all_employees() == ["John Doe"]
+
+            stats = await db_manager.stats()
+            assert stats["cache"]["hits"] == 1
+            assert stats["methods"]["get_all_employees"]["count"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_opening_does_not_block_the_event_loop(monkeypatch):
+    def slow_open(*args, **kwargs):
+        time.sleep(0.2)  # e.g. migrating a large file
+        return async_database_manager.DatabaseManager(*args, **kwargs)
+
+    async def scenario():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        monkeypatch.setattr(async_database_manager, "DatabaseManager", slow_open)
+        db_manager = AsyncDatabaseManager(":memory:")
+        monkeypatch.undo()
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError, match="still opening"):
+            await db_manager.get_all_employees()
+        async with db_manager:
+            assert len(ticks) >= 5
+        ticking.cancel()
+
+        db_manager = await AsyncDatabaseManager.open(":memory:")
+        await db_manager.create_tables()
+        await db_manager.insert_employees_bulk([("John Doe", "HR", "1"), ("Jane Smith", "IT", "2")])
+        assert await db_manager.get_employees_page(limit=1) == ["Jane Smith"]
+        assert await db_manager.search_employees("jo") == ["John Doe"]
+        query = "SELECT employee_name FROM Employees WHERE department = ?"
+        assert [row async for row in db_manager.iter_query(query, ("IT",))] == [("Jane Smith",)]
+        await db_manager.close()
+
+    asyncio.run(scenario())
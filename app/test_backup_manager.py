@@ -0,0 +1,48 @@
+from backup_manager import DELTA_SUFFIX, FULL_SUFFIX, SnapshotManager, integrity_check
+from database_manager import DatabaseManager
+
+
+def test_online_backup_reports_progress(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "company.db"))
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk((f"Employee {i}", "IT", str(i)) for i in range(2000))
+
+    steps = []
+    future = db_manager.backup_in_background(
+        str(tmp_path / "copy.db"), pages=5, progress=lambda status, remaining, total: steps.append(remaining)
+    )
+    assert future.result(timeout=10) == str(tmp_path / "copy.db")
+    assert len(steps) > 1 and steps[-1] == 0
+    assert integrity_check(str(tmp_path / "copy.db")) == ["ok"]
+
+    copy = DatabaseManager(str(tmp_path / "copy.db"))
+    assert len(copy.get_all_employees()) == 2000
+    copy.close()
+    db_manager.close()
+
+
+def test_incremental_snapshots_restore_and_retention(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "company.db"))
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk((f"Employee {i}", "IT", str(i)) for i in range(2000))
+    snapshots = SnapshotManager(db_manager, str(tmp_path / "snapshots"), retention=2)
+
+    full = snapshots.create_snapshot()
+    db_manager.insert_employee("John Doe", "HR", "1")
+    delta = snapshots.create_snapshot(incremental=True)
+    assert full.endswith(FULL_SUFFIX) and delta.endswith(DELTA_SUFFIX)
+    assert (tmp_path / "snapshots" / delta).stat().st_size < (tmp_path / "snapshots" / full).stat().st_size
+
+    assert snapshots.verify(delta) == ["ok"]
+    snapshots.restore(delta, str(tmp_path / "restored.db"))
+    restored = DatabaseManager(str(tmp_path / "restored.db"))
+    assert len(restored.get_all_employees()) == 2001
+    assert restored.search_employees("john") == ["John Doe"]
+    restored.close()
+
+    snapshots.create_snapshot_in_background().result(timeout=10)
+    snapshots.create_snapshot()
+    names = snapshots.list_snapshots()
+    assert full not in names and delta not in names
+    assert len(names) == 2
+    db_manager.close()
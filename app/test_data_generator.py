@@ -1,4 +1,111 @@
-from database_manager import DatabaseManager
+import random
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterator, List, Set, Tuple
+
+from database_manager import DEFAULT_CHUNK_SIZE, DatabaseManager
+
+
+FIRST_NAMES: Tuple[str, ...] = (
+    "Alexander", "Anna", "Dmitry", "Elena", "Ivan", "Irina", "Maxim", "Maria",
+    "Nikolai", "Natalia", "Pavel", "Olga", "Sergei", "Svetlana", "Viktor", "Tatiana",
+)
+LAST_NAMES: Tuple[str, ...] = (
+    "Ivanov", "Smirnov", "Kuznetsov", "Popov", "Vasiliev", "Petrov", "Sokolov", "Mikhailov",
+    "Novikov", "Fedorov", "Morozov", "Volkov", "Alekseev", "Lebedev", "Semenov", "Egorov",
+)
+DEPARTMENTS: Tuple[str, ...] = (
+    "Finance", "HR", "IT", "Legal", "Logistics", "Marketing", "Procurement", "Production",
+    "Quality", "Research", "Sales", "Security",
+)
+DOCUMENT_KINDS: Tuple[str, ...] = (
+    "Regulation", "Instruction", "Manual", "Standard", "Specification", "Policy", "Order", "Guide",
+)
+DOCUMENT_SUBJECTS: Tuple[str, ...] = (
+    "labour safety", "fire safety", "information security", "quality management", "procurement",
+    "document control", "equipment maintenance", "personal data", "travel expenses", "warehouse",
+)
+
+
+def employee_name(index: int) -> str:
+    """Name of the index-th generated employee (1-based)."""
+    return f"Employee {index}"
+
+
+def document_designation(index: int) -> str:
+    """Designation of the index-th generated document (1-based)."""
+    return f"DOC-{index:03d}"
+
+
+def generate_employees(count: int, seed: int = 0) -> Iterator[Tuple[str, str, str]]:
+    """Yield (employee_name, department, contact_phone) rows; departments have skewed sizes."""
+    generator: random.Random = random.Random(seed)
+    department_weights: List[float] = list(accumulate(1 / rank for rank in range(1, len(DEPARTMENTS) + 1)))
+    for index in range(1, count + 1):
+        department: str = generator.choices(DEPARTMENTS, cum_weights=department_weights)[0]
+        phone: int = generator.randrange(10**10)
+        contact_phone: str = (
+            f"+7 ({phone // 10**7:03d}) {phone // 10**4 % 1000:03d}-{phone // 100 % 100:02d}-{phone % 100:02d}"
+        )
+        yield employee_name(index), department, contact_phone
+
+
+def generate_documents(count: int, seed: int = 0) -> Iterator[Tuple[str, str, int]]:
+    """Yield (document_designation, document_name, document_quantity) rows."""
+    generator: random.Random = random.Random(seed + 1)
+    for index in range(1, count + 1):
+        document_name: str = f"{generator.choice(DOCUMENT_KINDS)} on {generator.choice(DOCUMENT_SUBJECTS)}"
+        yield document_designation(index), document_name, generator.randint(1, 50)
+
+
+def generate_links(
+    employee_count: int,
+    document_count: int,
+    links_per_employee: float = 3.0,
+    skew: float = 1.1,
+    seed: int = 0,
+) -> Iterator[Tuple[str, str, int]]:
+    """
+    Yield (employee_name, document_designation, document_instance_number) rows.
+    Each employee holds 1..2*links_per_employee distinct documents, picked with Zipf-like
+    popularity: the document of rank r is chosen with weight 1 / r ** skew.
+    """
+    if document_count < 1:
+        return
+    generator: random.Random = random.Random(seed + 2)
+    cumulative_weights: List[float] = list(accumulate(1 / rank**skew for rank in range(1, document_count + 1)))
+    total_weight: float = cumulative_weights[-1]
+    # Popularity ranks are shuffled so that popular documents are spread over the designations
+    ranked_documents: List[int] = list(range(1, document_count + 1))
+    generator.shuffle(ranked_documents)
+    issued: List[int] = [0] * (document_count + 1)
+
+    maximum_links: int = max(1, min(document_count, round(2 * links_per_employee)))
+    for index in range(1, employee_count + 1):
+        held: Set[int] = set()
+        for _ in range(generator.randint(1, maximum_links)):
+            rank: int = bisect_left(cumulative_weights, generator.random() * total_weight)
+            document: int = ranked_documents[min(rank, document_count - 1)]
+            if document in held:
+                continue
+            held.add(document)
+            issued[document] += 1
+            yield employee_name(index), document_designation(document), issued[document]
+
+
+def generate_test_data(
+    db: DatabaseManager,
+    employee_count: int = 40,
+    document_count: int = 40,
+    links_per_employee: float = 3.0,
+    skew: float = 1.1,
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """Stream seeded employees, documents and Zipf-distributed links into the database."""
+    db.insert_employees_bulk(generate_employees(employee_count, seed), chunk_size)
+    db.insert_documents_bulk(generate_documents(document_count, seed), chunk_size)
+    db.link_bulk(generate_links(employee_count, document_count, links_per_employee, skew, seed), chunk_size)
 
 
 def test_database_manager():
@@ -40,6 +147,25 @@ def test_database_manager():
     print("All tests passed successfully!")
 
 
+def test_generate_test_data_is_seeded_and_consistent():
+    first = list(generate_links(200, 50, seed=7))
+    assert first == list(generate_links(200, 50, seed=7))
+    assert len(set((employee, document) for employee, document, _ in first)) == len(first)
+
+    db_manager = DatabaseManager(":memory:")
+    db_manager.create_tables()
+    generate_test_data(db_manager, employee_count=200, document_count=50, seed=7)
+    assert len(db_manager.get_all_employees()) == 200
+    assert len(db_manager.get_all_documents()) == 50
+    assert sum(1 for _ in db_manager.iter_links()) == len(first)
+
+    # The most popular document is held by far more employees than the median one
+    holders = sorted(len(db_manager.get_employees_by_document(document_designation(i))) for i in range(1, 51))
+    assert holders[-1] > 5 * max(holders[25], 1)
+    db_manager.close()
+
+
 if __name__ == "__main__":
     # Run tests
     test_database_manager()
+    test_generate_test_data_is_seeded_and_consistent()
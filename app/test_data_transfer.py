@@ -0,0 +1,106 @@
+import json
+import logging
+
+import pytest
+
+from data_transfer import export_file, import_file, main
+from database_manager import BulkResult, DatabaseManager
+
+
+def test_csv_import_and_jsonl_export_round_trip(tmp_path):
+    employees_csv = tmp_path / "employees.csv"
+    employees_csv.write_text(
+        "employee_name,department,contact_phone\nJohn Doe,HR,1\nJane Smith,IT,2\nJohn Doe,HR,1\n",
+        encoding="utf-8",
+    )
+    documents_jsonl = tmp_path / "documents.jsonl"
+    documents_jsonl.write_text(
+        '{"document_designation": "DOC001", "document_name": "Handbook", "document_quantity": "10"}\n',
+        encoding="utf-8",
+    )
+    links_csv = tmp_path / "links.csv"
+    links_csv.write_text(
+        "employee_name,document_designation,document_instance_number\nJohn Doe,DOC001,1\n",
+        encoding="utf-8",
+    )
+
+    db_manager = DatabaseManager(":memory:")
+    db_manager.create_tables()
+    assert import_file(db_manager, str(employees_csv), "employees", progress=False) == BulkResult(2, 1, 0)
+    assert import_file(db_manager, str(documents_jsonl), "documents", progress=False) == BulkResult(1, 0, 0)
+    assert import_file(db_manager, str(links_csv), "links", progress=False) == BulkResult(1, 0, 0)
+
+    export_path = tmp_path / "employee_documents.jsonl"
+    assert export_file(db_manager, str(export_path), "employee_documents", chunk_size=1, progress=False) == 1
+    record = json.loads(export_path.read_text(encoding="utf-8"))
+    assert record["employee_name"] == "John Doe"
+    assert record["document_quantity"] == 10
+    assert record["document_instance_number"] == 1
+    db_manager.close()
+
+
+def test_invalid_rows_abort_unless_skipped(tmp_path):
+    documents_csv = tmp_path / "documents.csv"
+    documents_csv.write_text(
+        "document_designation,document_name,document_quantity\nDOC001,Handbook,ten\nDOC002,Policy,5\n",
+        encoding="utf-8",
+    )
+    db_manager = DatabaseManager(":memory:")
+    db_manager.create_tables()
+
+    with pytest.raises(ValueError, match="Row 1"):
+        import_file(db_manager, str(documents_csv), "documents", progress=False)
+    assert db_manager.get_all_documents() == []
+
+    result = import_file(db_manager, str(documents_csv), "documents", skip_invalid=True, progress=False)
+    assert result == BulkResult(1, 0, 0)
+    db_manager.close()
+
+
+def test_byte_order_mark_is_ignored(tmp_path):
+    employees_csv = tmp_path / "employees.csv"
+    employees_csv.write_text("employee_name,department,contact_phone\nJohn Doe,HR,1\n", encoding="utf-8-sig")
+    db_manager = DatabaseManager(":memory:")
+    db_manager.create_tables()
+
+    assert import_file(db_manager, str(employees_csv), "employees", progress=False) == BulkResult(1, 0, 0)
+    db_manager.close()
+
+
+def test_malformed_jsonl_lines_are_skipped(tmp_path, caplog):
+    employees_jsonl = tmp_path / "employees.jsonl"
+    employees_jsonl.write_text(
+        '{"employee_name": "John Doe", "department": "HR", "contact_phone": "1"}\n'
+        "[1, 2]\n"
+        '{"employee_name": "Jane\n'
+        '{"employee_name": "Jane Smith", "department": "IT", "contact_phone": "2"}\n',
+        encoding="utf-8",
+    )
+    db_manager = DatabaseManager(":memory:")
+    db_manager.create_tables()
+
+    with pytest.raises(ValueError, match="Row 2: expected an object"):
+        import_file(db_manager, str(employees_jsonl), "employees", progress=False)
+    assert db_manager.get_all_employees() == []
+
+    with caplog.at_level(logging.WARNING, logger="data_transfer"):
+        result = import_file(db_manager, str(employees_jsonl), "employees", skip_invalid=True, progress=False)
+    assert result == BulkResult(2, 0, 0)
+    assert [record.row_number for record in caplog.records if record.event == "invalid_row"] == [2, 3]
+    assert db_manager.get_all_employees() == ["Jane Smith", "John Doe"]
+    db_manager.close()
+
+
+def test_command_line_export(tmp_path):
+    db_path = str(tmp_path / "company.db")
+    db_manager = DatabaseManager(db_path)
+    db_manager.create_tables()
+    db_manager.insert_employee("John Doe", "HR", "1")
+    db_manager.close()
+
+    export_path = tmp_path / "employees.csv"
+    assert main(["export", "employees", str(export_path), "--db", db_path, "--quiet"]) == 0
+    assert export_path.read_text(encoding="utf-8").splitlines() == [
+        "employee_name,department,contact_phone",
+        "John Doe,HR,1",
+    ]
@@ -0,0 +1,492 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from database_manager import (
+    DOCUMENTS_BY_EMPLOYEE_QUERY,
+    EMPLOYEES_BY_DOCUMENT_QUERY,
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    BulkResult,
+    DatabaseManager,
+    DocumentLink,
+    EmployeeLink,
+    LookupCache,
+    Session,
+)
+from migrations import run_migrations
+
+
+def make_database() -> DatabaseManager:
+    db_manager = DatabaseManager(":memory:")
+    db_manager.create_tables()
+    return db_manager
+
+
+def test_insert_employees_bulk_skips_existing():
+    db_manager = make_database()
+    db_manager.insert_employee("John Doe", "HR", "123-456-7890")
+
+    rows = ((f"Employee {i}", "IT", f"555-{i:04d}") for i in range(5))
+    result = db_manager.insert_employees_bulk(
+        [("John Doe", "Finance", "000")] + list(rows), chunk_size=2
+    )
+
+    assert result == BulkResult(inserted=5, skipped=1, updated=0)
+    assert len(db_manager.get_all_employees()) == 6
+    db_manager.close()
+
+
+def test_insert_documents_bulk_updates_existing():
+    db_manager = make_database()
+    db_manager.insert_document("DOC001", "Employee Handbook", 10)
+
+    result = db_manager.insert_documents_bulk(
+        [("DOC001", "Employee Handbook", 12), ("DOC002", "IT Security Policy", 5)],
+        update_existing=True,
+    )
+
+    assert result == BulkResult(inserted=1, skipped=0, updated=1)
+    db_manager.close()
+
+
+def test_link_bulk_counts_inserted_skipped_and_updated():
+    db_manager = make_database()
+    db_manager.insert_employees_bulk([("John Doe", "HR", "1"), ("Jane Smith", "IT", "2")])
+    db_manager.insert_documents_bulk([("DOC001", "Handbook", 10), ("DOC002", "Policy", 5)])
+    db_manager.link_employee_to_document("John Doe", "DOC001", 1)
+    db_manager.link_employee_to_document("Jane Smith", "DOC001", 2)
+
+    result = db_manager.link_bulk(
+        [
+            ("John Doe", "DOC001", 1),
+            ("Jane Smith", "DOC001", 3),
+            ("Jane Smith", "DOC002", 4),
+        ]
+    )
+
+    assert result == BulkResult(inserted=1, skipped=1, updated=1)
+    assert sorted(db_manager.get_documents_by_employee("Jane Smith")) == ["DOC001", "DOC002"]
+    db_manager.close()
+
+
+def test_lookups_use_indexes():
+    db_manager = make_database()
+
+    for query in (EMPLOYEES_BY_DOCUMENT_QUERY, DOCUMENTS_BY_EMPLOYEE_QUERY):
+        plan = db_manager.explain(query, ("key",))
+        assert plan and not any(step.startswith("SCAN") for step in plan), plan
+
+    plan = db_manager.explain("SELECT employee_name FROM Employees WHERE department = ?", ("HR",))
+    assert any("idx_employees_department" in step for step in plan), plan
+    db_manager.close()
+
+
+def create_legacy_file(db_path, employees, documents, links):
+    """Create a file with the text-keyed schema used before the schema was versioned."""
+    connection = sqlite3.connect(db_path)
+    connection.executescript(
+        """
+        CREATE TABLE Employees (employee_name TEXT PRIMARY KEY NOT NULL, department TEXT NOT NULL,
+                                contact_phone TEXT NOT NULL);
+        CREATE TABLE Documents (document_designation TEXT PRIMARY KEY NOT NULL, document_name TEXT NOT NULL,
+                                document_quantity INTEGER NOT NULL);
+        CREATE TABLE Employees_Documents (employee_name TEXT NOT NULL, document_designation TEXT NOT NULL,
+                                          document_instance_number INTEGER NOT NULL,
+                                          PRIMARY KEY (employee_name, document_designation));
+        """
+    )
+    connection.executemany("INSERT INTO Employees VALUES (?, ?, ?)", employees)
+    connection.executemany("INSERT INTO Documents VALUES (?, ?, ?)", documents)
+    connection.executemany("INSERT INTO Employees_Documents VALUES (?, ?, ?)", links)
+    connection.commit()
+    connection.close()
+
+
+def test_opening_an_old_file_converts_keys_and_adds_indexes(tmp_path):
+    db_path = str(tmp_path / "old.db")
+    create_legacy_file(
+        db_path,
+        [("John Doe", "HR", "1"), ("Jane Smith", "IT", "2")],
+        [("DOC001", "Handbook", 10)],
+        [("John Doe", "DOC001", 1), ("Jane Smith", "DOC001", 2), ("Jane Smith", "DOC404", 1)],
+    )
+
+    db_manager = DatabaseManager(db_path)
+    plan = db_manager.explain(EMPLOYEES_BY_DOCUMENT_QUERY, ("DOC001",))
+    assert any("idx_employees_documents_document" in step for step in plan), plan
+    assert db_manager.search_employees("john") == ["John Doe"]
+
+    # Links are rekeyed by integer ids; the old rowids become the ids
+    assert sorted(db_manager.iter_links()) == [
+        ("Jane Smith", "DOC001", 2),
+        ("Jane Smith", "DOC404", 1),
+        ("John Doe", "DOC001", 1),
+    ]
+    ids = db_manager.connection.execute("SELECT employee_id, employee_name FROM Employees ORDER BY 1").fetchall()
+    assert ids == [(1, "John Doe"), (2, "Jane Smith")]
+    without_rowid = db_manager.connection.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'Employees_Documents'"
+    ).fetchone()[0]
+    assert "WITHOUT ROWID" in without_rowid
+    db_manager.link_employee_to_document("John Doe", "DOC404", 3)
+    assert sorted(db_manager.get_documents_by_employee("John Doe")) == ["DOC001", "DOC404"]
+    db_manager.close()
+
+
+@contextmanager
+def raw_session(connection):
+    connection.execute("BEGIN IMMEDIATE")
+    yield Session(connection, write=True)
+    connection.execute("COMMIT")
+
+
+def test_interrupted_migration_resumes_on_next_open(tmp_path):
+    db_path = str(tmp_path / "old.db")
+    create_legacy_file(
+        db_path,
+        [(f"Employee {i}", "IT", str(i)) for i in range(25)],
+        [(f"DOC{i}", "Handbook", 1) for i in range(3)],
+        [(f"Employee {i}", f"DOC{i % 3}", i) for i in range(25)],
+    )
+
+    units = []
+
+    def interrupt(migration, step, position):
+        units.append((migration.version, step, position))
+        if len(units) == 3:
+            raise KeyboardInterrupt
+
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    with pytest.raises(KeyboardInterrupt):
+        run_migrations(lambda: raw_session(connection), MIGRATIONS, batch_size=10, progress=interrupt)
+    connection.close()
+    # The rename and the first two batches of employees were committed
+    assert units == [(1, 1, 0), (1, 1, 10), (1, 1, 20)]
+
+    db_manager = DatabaseManager(db_path)
+    assert len(db_manager.get_all_employees()) == 25
+    assert sorted(db_manager.iter_links())[:2] == [("Employee 0", "DOC0", 0), ("Employee 1", "DOC1", 1)]
+    assert sum(1 for _ in db_manager.iter_links()) == 25
+    assert db_manager.search_employees("Employee 24") == ["Employee 24"]
+    assert db_manager.migrate() == SCHEMA_VERSION
+    tables = {row[0] for row in db_manager.connection.execute("SELECT name FROM sqlite_master")}
+    assert "Schema_Migration_Progress" not in tables and "Employees_Legacy" not in tables
+    db_manager.close()
+
+
+def test_new_files_start_at_the_current_schema_version(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "new.db"))
+    assert db_manager.migrate() == 0
+    db_manager.create_tables()
+    assert db_manager.migrate() == SCHEMA_VERSION
+    db_manager.close()
+
+
+def test_version_3_files_get_deferrable_search_triggers(tmp_path):
+    db_path = str(tmp_path / "v3.db")
+    DatabaseManager(db_path).create_tables()
+    connection = sqlite3.connect(db_path)
+    with connection:
+        # The version 3 trigger indexed every inserted row
+        connection.execute("DROP TRIGGER Employees_Search_Insert")
+        connection.execute(
+            "CREATE TRIGGER Employees_Search_Insert AFTER INSERT ON Employees BEGIN "
+            "INSERT INTO Employees_Search (rowid, employee_name, department, contact_phone) "
+            "VALUES (new.rowid, new.employee_name, new.department, new.contact_phone); END"
+        )
+        connection.execute("DROP TABLE Search_Index_Deferred")
+        connection.execute("PRAGMA user_version = 3")
+    connection.close()
+
+    db_manager = DatabaseManager(db_path)
+    trigger = db_manager.connection.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'Employees_Search_Insert'"
+    ).fetchone()[0]
+    assert "Search_Index_Deferred" in trigger
+    db_manager.insert_employees_bulk([("John Doe", "HR", "1")])
+    assert db_manager.search_employees("john") == ["John Doe"]
+    db_manager.connection.execute("INSERT INTO Employees_Search (Employees_Search) VALUES ('integrity-check')")
+    db_manager.close()
+
+
+def test_links_require_existing_employee_and_document():
+    db_manager = make_database()
+    db_manager.insert_employee("John Doe", "HR", "1")
+
+    with pytest.raises(ValueError):
+        db_manager.link_employee_to_document("John Doe", "DOC001", 1)
+    assert db_manager.link_bulk([("John Doe", "DOC001", 1), ("Nobody", "DOC001", 1)]) == BulkResult(0, 2, 0)
+    db_manager.close()
+
+
+def test_profiles_are_applied_and_queryable(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "company.db"), profile="fast")
+    settings = db_manager.settings()
+    assert settings["journal_mode"] == "wal"
+    assert settings["synchronous"] == "NORMAL"
+    assert settings["temp_store"] == "MEMORY"
+
+    db_manager.apply_profile("bulk")
+    assert db_manager.profile == "bulk"
+    assert db_manager.settings()["synchronous"] == "OFF"
+    db_manager.close()
+
+    with pytest.raises(ValueError):
+        DatabaseManager(":memory:", profile="turbo")
+
+
+def test_reader_is_not_blocked_by_open_write_transaction(tmp_path):
+    db_path = str(tmp_path / "company.db")
+    writer = DatabaseManager(db_path)
+    writer.create_tables()
+    writer.insert_employee("John Doe", "HR", "1")
+    reader = DatabaseManager(db_path)
+
+    writer.cursor.execute("INSERT INTO Employees (employee_name, department, contact_phone) VALUES ('Jane Smith', 'IT', '2')")
+    assert reader.get_all_employees() == ["John Doe"]
+    writer.connection.commit()
+    assert sorted(reader.get_all_employees()) == ["Jane Smith", "John Doe"]
+
+    reader.close()
+    writer.close()
+
+
+def test_session_rolls_back_on_error():
+    db_manager = make_database()
+
+    with pytest.raises(RuntimeError):
+        with db_manager.session():
+            db_manager.insert_employee("John Doe", "HR", "1")
+            db_manager.insert_document("DOC001", "Handbook", 10)
+            raise RuntimeError("abort")
+
+    assert db_manager.get_all_employees() == []
+    assert db_manager.get_all_documents() == []
+
+    with db_manager.session() as session:
+        session.execute("INSERT INTO Employees (employee_name, department, contact_phone) VALUES ('Jane Smith', 'IT', '2')")
+        db_manager.insert_employee("John Doe", "HR", "1")
+    assert sorted(db_manager.get_all_employees()) == ["Jane Smith", "John Doe"]
+
+    with pytest.raises(RuntimeError):
+        with db_manager.session(write=False):
+            db_manager.insert_employee("Max Mustermann", "IT", "3")
+    db_manager.close()
+
+
+def test_pooled_manager_serves_concurrent_threads(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "company.db"), pool_size=4)
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk((f"Employee {i}", "IT", str(i)) for i in range(8))
+    db_manager.insert_document("DOC001", "Handbook", 100)
+    errors = []
+
+    def worker(index):
+        try:
+            for instance_number in range(20):
+                db_manager.link_employee_to_document(f"Employee {index}", "DOC001", instance_number)
+                assert "DOC001" in db_manager.get_documents_by_employee(f"Employee {index}")
+                db_manager.get_employees_by_document("DOC001")
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(db_manager.get_employees_by_document("DOC001")) == 8
+    assert sorted(db_manager.iter_links()) == [(f"Employee {i}", "DOC001", 19) for i in range(8)]
+    db_manager.close()
+
+
+def test_abandoned_iterator_times_out_instead_of_blocking(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "company.db"), pool_size=1, reader_timeout=0.1)
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk((f"Employee {i}", "IT", str(i)) for i in range(3))
+
+    rows = db_manager.iter_employees(chunk_size=1)
+    next(rows)  # holds the only reader
+    with pytest.raises(RuntimeError, match="No pooled reader"):
+        db_manager.get_all_employees()
+    rows.close()
+    assert len(db_manager.get_all_employees()) == 3
+    db_manager.close()
+
+
+def test_close_also_closes_readers_in_use(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "company.db"), pool_size=2)
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk((f"Employee {i}", "IT", str(i)) for i in range(3))
+    rows = db_manager.iter_employees(chunk_size=1)
+    next(rows)  # a background load still holding its reader
+
+    db_manager.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        next(rows)
+    rows.close()
+    for reader in db_manager._reader_connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            reader.execute("SELECT 1")
+
+
+def test_lookup_cache_is_invalidated_by_writes():
+    db_manager = DatabaseManager(":memory:", cache_size=16)
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk([("John Doe", "HR", "1"), ("Jane Smith", "IT", "2")])
+    db_manager.insert_documents_bulk([("DOC001", "Handbook", 10), ("DOC002", "Policy", 5)])
+
+    assert sorted(db_manager.get_all_employees()) == ["Jane Smith", "John Doe"]
+    assert db_manager.get_all_employees() == db_manager.get_all_employees()
+    assert db_manager.get_documents_by_employee("John Doe") == []
+    assert db_manager.get_documents_by_employee("Jane Smith") == []
+    assert db_manager.get_employees_by_document("DOC001") == []
+    assert db_manager.cache.stats()["hits"] == 2
+
+    db_manager.link_employee_to_document("John Doe", "DOC001", 1)
+    stats = db_manager.cache.stats()
+    assert stats["invalidations"] == 2
+    assert stats["size"] == 2  # all employees and Jane Smith's documents survive
+
+    assert db_manager.get_documents_by_employee("John Doe") == ["DOC001"]
+    assert db_manager.get_employees_by_document("DOC001") == ["John Doe"]
+    db_manager.insert_employee("Max Mustermann", "IT", "3")
+    assert len(db_manager.get_all_employees()) == 3
+
+    with pytest.raises(RuntimeError):
+        with db_manager.session():
+            db_manager.insert_document("DOC003", "Manual", 1)
+            assert len(db_manager.get_all_documents()) == 3
+            raise RuntimeError("abort")
+    assert len(db_manager.get_all_documents()) == 2
+    db_manager.close()
+
+
+def test_read_session_snapshot_does_not_poison_the_cache(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "company.db"), pool_size=2, cache_size=16)
+    db_manager.create_tables()
+    db_manager.insert_employee("A", "HR", "1")
+    db_manager.insert_document("D", "Handbook", 1)
+
+    with db_manager.session(write=False):
+        assert db_manager.get_all_employees() == ["A"]  # pins the snapshot
+        writer = threading.Thread(target=db_manager.link_employee_to_document, args=("A", "D", 1))
+        writer.start()
+        writer.join()
+        assert db_manager.get_documents_by_employee("A") == []
+
+    assert db_manager.get_documents_by_employee("A") == ["D"]
+    db_manager.close()
+
+
+def test_lookup_cache_bounds():
+    cache = LookupCache(max_size=2, ttl=0)
+    assert cache.get_or_load("a", lambda: ["1"]) == ["1"]
+    assert cache.get_or_load("a", lambda: ["2"]) == ["2"]
+    assert cache.stats()["expirations"] == 1
+
+    cache = LookupCache(max_size=2)
+    for key in ("a", "b", "c"):
+        cache.get_or_load(key, lambda: [key])
+    assert cache.stats()["evictions"] == 1
+    assert cache.get_or_load("a", lambda: ["reloaded"]) == ["reloaded"]
+
+
+def test_batch_lookups_match_single_lookups():
+    db_manager = make_database()
+    db_manager.insert_employees_bulk((f"Employee {i}", "IT", str(i)) for i in range(30))
+    db_manager.insert_documents_bulk((f"DOC{i:03d}", "Handbook", 10) for i in range(7))
+    db_manager.link_bulk((f"Employee {i}", f"DOC{i % 7:03d}", i) for i in range(30))
+    documents = [f"DOC{i:03d}" for i in range(7)] + ["DOC404"]
+
+    by_document = db_manager.get_employees_by_documents(documents, keys_per_query=3)
+    assert {key: sorted(names) for key, names in by_document.items()} == {
+        document: sorted(db_manager.get_employees_by_document(document)) for document in documents
+    }
+    assert by_document["DOC404"] == []
+
+    by_employee = db_manager.get_documents_by_employees(["Employee 8", "Employee 8", "Nobody"], records=True)
+    assert by_employee == {"Employee 8": [DocumentLink("DOC001", "Handbook", 10, 8)], "Nobody": []}
+    records = db_manager.get_employees_by_documents(["DOC002"], records=True)["DOC002"]
+    assert EmployeeLink("Employee 9", "IT", "9", 9) in records and len(records) == 4
+    db_manager.close()
+
+
+def test_keyset_pages_cover_every_row_once():
+    db_manager = make_database()
+    db_manager.insert_employees_bulk((f"Employee {i:02d}", "IT", str(i)) for i in range(25))
+    db_manager.insert_documents_bulk((f"DOC{i:03d}", "Handbook", 1) for i in range(7))
+
+    pages = []
+    after = None
+    while True:
+        page = db_manager.get_employees_page(after, limit=10)
+        if not page:
+            break
+        pages.append(page)
+        after = page[-1]
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert sum(pages, []) == sorted(db_manager.get_all_employees())
+
+    assert db_manager.get_documents_page("DOC004", limit=10) == ["DOC005", "DOC006"]
+    plan = db_manager.explain("SELECT employee_name FROM Employees WHERE employee_name > ? ORDER BY employee_name", ("",))
+    assert not any(step.startswith("SCAN") for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+    db_manager.close()
+
+
+def test_search_follows_inserts_and_updates():
+    db_manager = make_database()
+    db_manager.insert_employee("Иванов Иван", "Финансы", "+7 (900) 123-45-67")
+    db_manager.insert_employees_bulk([("John Doe", "HR", "555-0100")])
+    db_manager.insert_document("GOST-2.105", "General requirements for text documents", 3)
+
+    assert db_manager.search_employees("ив") == ["Иванов Иван"]
+    assert db_manager.search_employees("фин 900") == ["Иванов Иван"]
+    assert db_manager.search_employees("jo") == ["John Doe"]
+    assert db_manager.search_employees('"') == []
+    assert db_manager.search_documents("gost-2") == ["GOST-2.105"]
+    assert db_manager.search_documents("requirements") == ["GOST-2.105"]
+
+    db_manager.insert_employees_bulk([("John Doe", "IT", "555-0100")], update_existing=True)
+    assert db_manager.search_employees("hr") == []
+    assert db_manager.search_employees("it") == ["John Doe"]
+    db_manager.close()
+
+
+def test_bulk_loads_index_search_in_batches():
+    db_manager = make_database()
+    db_manager.insert_employee("Иванов Иван", "Finance", "1")
+    rows = [(f"Employee {i}", "Finance" if i % 2 else "HR", str(i)) for i in range(7)]
+    assert db_manager.insert_employees_bulk(rows + [("Иванов Иван", "IT", "2")], chunk_size=3) == BulkResult(7, 1, 0)
+    db_manager.insert_documents_bulk([("DOC001", "Handbook", 1), ("DOC002", "Policy", 1)], chunk_size=1)
+    # Writes outside the bulk methods are still indexed by the triggers
+    with db_manager.session() as session:
+        session.execute("INSERT INTO Employees (employee_name, department, contact_phone) VALUES ('Jane', 'IT', '9')")
+
+    assert sorted(db_manager.search_employees("fin", limit=10)) == [
+        "Employee 1", "Employee 3", "Employee 5", "Иванов Иван"
+    ]
+    assert db_manager.search_employees("Employee 6") == ["Employee 6"]
+    assert db_manager.search_employees("jane") == ["Jane"]
+    assert db_manager.search_documents("pol") == ["DOC002"]
+    for table in ("Employees_Search", "Documents_Search"):
+        db_manager.connection.execute(f"INSERT INTO {table} ({table}) VALUES ('integrity-check')")
+    assert db_manager.connection.execute("SELECT COUNT(*) FROM Search_Index_Deferred").fetchone()[0] == 0
+    db_manager.close()
+
+
+def test_data_layer_imports_without_qt():
+    # Scripts, the service and the tests must not pay for (or need) the GUI toolkit
+    code = "import sys, database_manager, reports, service; print([m for m in sys.modules if m.startswith('PyQt')])"
+    directory = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
@@ -0,0 +1,82 @@
+import logging
+import time
+
+from database_manager import DatabaseManager
+from instrumentation import LatencyHistogram, normalize_statement
+
+
+def test_stats_without_instrumentation_only_report_the_cache():
+    db_manager = DatabaseManager(":memory:", cache_size=8)
+    db_manager.create_tables()
+    db_manager.get_all_employees()
+
+    assert db_manager.instrumentation is None
+    assert db_manager.stats() == {"cache": db_manager.cache.stats()}
+    db_manager.close()
+
+
+def test_methods_statements_and_commits_are_measured():
+    db_manager = DatabaseManager(":memory:", instrument=True)
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk([("John Doe", "HR", "1"), ("Jane Smith", "IT", "2")])
+    for _ in range(3):
+        db_manager.get_all_employees()
+    db_manager.get_documents_by_employees(["John Doe", "Jane Smith"])
+
+    stats = db_manager.stats()
+    assert stats["methods"]["get_all_employees"]["count"] == 3
+    assert stats["methods"]["get_all_employees"]["rows"] == 6
+    assert stats["statements"]["SELECT employee_name FROM Employees"]["count"] == 3
+    # Row counts and timings include fetching the rows, not just the first step
+    assert stats["statements"]["SELECT employee_name FROM Employees"]["rows"] == 6
+    assert any("IN (?, ...)" in statement for statement in stats["statements"])
+    # create_tables and the bulk insert each committed one write transaction
+    assert stats["commits"]["count"] == 2
+    assert stats["slow_queries"] == 0
+    db_manager.close()
+
+
+def test_slow_queries_and_duplicates_are_logged(caplog):
+    db_manager = DatabaseManager(":memory:", slow_query_ms=0)
+    db_manager.create_tables()
+
+    with caplog.at_level(logging.INFO):
+        db_manager.insert_employee("John Doe", "HR", "1")
+        db_manager.insert_employee("John Doe", "HR", "1")
+        db_manager.get_documents_by_employee("John Doe")
+
+    duplicates = [record for record in caplog.records if getattr(record, "event", None) == "duplicate_employee"]
+    assert len(duplicates) == 1 and duplicates[0].employee_name == "John Doe"
+    slow = [record for record in caplog.records if getattr(record, "event", None) == "slow_query"]
+    lookup = [record for record in slow if record.statement.startswith("SELECT d.document_designation")]
+    assert lookup and any(step.startswith("SEARCH") for step in lookup[0].plan)
+    assert db_manager.stats()["slow_queries"] == len(slow)
+    db_manager.close()
+
+
+def test_slow_full_scans_are_measured_until_the_last_row(caplog):
+    db_manager = DatabaseManager(":memory:", slow_query_ms=15)
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk((f"Employee {i}", "IT", str(i)) for i in range(5))
+    # 5 ms per row: the first step alone stays below the threshold, the whole scan does not
+    db_manager.connection.create_function("slow", 1, lambda value: time.sleep(0.005) or value)
+    query = "SELECT slow(employee_name) FROM Employees"
+
+    with caplog.at_level(logging.WARNING):
+        assert len(list(db_manager.iter_query(query, chunk_size=2))) == 5
+
+    statement = db_manager.stats()["statements"][query]
+    assert statement["rows"] == 5 and statement["max_ms"] >= 25
+    slow = [record for record in caplog.records if getattr(record, "event", None) == "slow_query"]
+    assert [record.statement for record in slow] == [query]
+    db_manager.close()
+
+
+def test_histogram_percentiles_and_statement_keys():
+    histogram = LatencyHistogram()
+    for milliseconds in [0.2] * 90 + [30.0] * 10:
+        histogram.add(milliseconds)
+
+    assert histogram.percentile(0.5) == 0.25
+    assert histogram.percentile(0.99) == 30.0
+    assert normalize_statement("SELECT x\n    FROM t WHERE y IN (?, ?,?)") == "SELECT x FROM t WHERE y IN (?, ...)"
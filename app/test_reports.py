@@ -0,0 +1,75 @@
+import io
+
+from database_manager import DatabaseManager
+from reports import (
+    DepartmentHolding,
+    DocumentAllocation,
+    InstanceCollision,
+    department_holdings,
+    document_allocation,
+    instance_collisions,
+    main,
+    over_allocated_documents,
+    write_report,
+)
+
+
+def make_reporting_database() -> DatabaseManager:
+    db_manager = DatabaseManager(":memory:")
+    db_manager.create_tables()
+    db_manager.insert_employees_bulk(
+        [("John Doe", "HR", "1"), ("Jane Smith", "IT", "2"), ("Max Mustermann", "IT", "3")]
+    )
+    db_manager.insert_documents_bulk([("DOC001", "Handbook", 2), ("DOC002", "Policy", 5), ("DOC003", "Manual", 1)])
+    db_manager.link_bulk(
+        [
+            ("John Doe", "DOC001", 1),
+            ("Jane Smith", "DOC001", 1),
+            ("Max Mustermann", "DOC001", 2),
+            ("Jane Smith", "DOC002", 1),
+            ("Max Mustermann", "DOC002", 2),
+        ]
+    )
+    return db_manager
+
+
+def test_allocation_reports():
+    db_manager = make_reporting_database()
+
+    assert list(document_allocation(db_manager, chunk_size=2)) == [
+        DocumentAllocation("DOC001", "Handbook", 2, 3, -1),
+        DocumentAllocation("DOC002", "Policy", 5, 2, 3),
+        DocumentAllocation("DOC003", "Manual", 1, 0, 1),
+    ]
+    assert [row.document_designation for row in over_allocated_documents(db_manager)] == ["DOC001"]
+    db_manager.close()
+
+
+def test_department_holdings_and_instance_collisions():
+    db_manager = make_reporting_database()
+
+    assert list(department_holdings(db_manager)) == [
+        DepartmentHolding("HR", "DOC001", 1),
+        DepartmentHolding("IT", "DOC001", 2),
+        DepartmentHolding("IT", "DOC002", 2),
+    ]
+    assert list(instance_collisions(db_manager)) == [InstanceCollision("DOC001", 1, ("Jane Smith", "John Doe"))]
+
+    output = io.StringIO()
+    assert write_report(db_manager, "collisions", output) == 1
+    assert output.getvalue().splitlines() == [
+        "document_designation,document_instance_number,employee_names",
+        "DOC001,1,Jane Smith; John Doe",
+    ]
+    db_manager.close()
+
+
+def test_main_reports_missing_or_foreign_database(tmp_path, capsys):
+    missing = tmp_path / "missing.db"
+    assert main(["allocation", "--db", str(missing)]) == 1
+    assert not missing.exists()
+    assert "database file not found" in capsys.readouterr().err
+
+    DatabaseManager(str(tmp_path / "empty.db")).close()
+    assert main(["allocation", "--db", str(tmp_path / "empty.db")]) == 1
+    assert "is not a document database" in capsys.readouterr().err
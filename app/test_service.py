@@ -0,0 +1,104 @@
+import http.client
+import json
+import threading
+import time
+
+from database_manager import DatabaseManager
+from service import DatabaseService, RequestCoalescer, make_server
+
+
+def make_service() -> DatabaseService:
+    db_manager = DatabaseManager(":memory:")
+    db_manager.create_tables()
+    return DatabaseService(db_manager)
+
+
+def test_writes_pages_and_lookups():
+    service = make_service()
+    employees = [{"employee_name": name, "department": "IT", "contact_phone": "1"} for name in ("A", "B", "C")]
+
+    assert service.handle("POST", "/employees", json.dumps(employees).encode()).status == 201
+    document = {"document_designation": "DOC 1", "document_name": "Handbook", "document_quantity": 2}
+    assert service.handle("POST", "/documents", json.dumps(document).encode()).body["inserted"] == 1
+    link = {"employee_name": "B", "document_designation": "DOC 1", "document_instance_number": 1}
+    assert service.handle("POST", "/links", json.dumps(link).encode()).status == 201
+
+    first = service.handle("GET", "/employees?limit=2")
+    assert first.body == {"items": ["A", "B"], "next": "B"} and first.cacheable
+    assert service.handle("GET", "/employees?limit=2&after=B").body == {"items": ["C"], "next": None}
+    assert service.handle("GET", "/documents/DOC%201/employees").body == {"items": ["B"]}
+    assert service.handle("GET", "/employees/B/documents").body == {"items": ["DOC 1"]}
+    assert service.handle("GET", "/search/employees?q=C").body == {"items": ["C"]}
+
+    assert service.handle("GET", "/employees?limit=0").status == 400
+    assert service.handle("POST", "/links", b"{").status == 400
+    assert service.handle("POST", "/employees", b'{"employee_name": "D"}').status == 400
+    assert service.handle("GET", "/nothing").status == 404
+    service.db.close()
+
+
+def test_concurrent_identical_calls_are_coalesced():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_lookup():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["result"]
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(coalescer.run("key", slow_lookup)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(coalescer.run("key", slow_lookup))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while coalescer.coalesced < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert coalescer.coalesced == 3
+
+    # After a write, identical calls no longer join the one still in flight
+    coalescer.forget()
+    assert coalescer.run("key", lambda: ["after write"]) == ["after write"]
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert calls == [1] and results == [["result"]] * 4
+    assert coalescer.run("key", lambda: ["again"]) == ["again"]
+
+
+def test_http_keep_alive_and_conditional_get(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "service.db"), pool_size=2)
+    db_manager.create_tables()
+    db_manager.insert_employee("John Doe", "HR", "1")
+    server = make_server(db_manager, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+        connection.request("GET", "/employees")
+        response = connection.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read()) == {"items": ["John Doe"], "next": None}
+        etag = response.getheader("ETag")
+
+        # Same connection: the server keeps it alive
+        connection.request("GET", "/employees", headers={"If-None-Match": etag})
+        response = connection.getresponse()
+        assert response.status == 304 and response.read() == b""
+
+        db_manager.insert_employee("Jane Smith", "IT", "2")
+        connection.request("GET", "/employees", headers={"If-None-Match": etag})
+        response = connection.getresponse()
+        assert response.status == 200 and response.getheader("ETag") != etag
+        assert json.loads(response.read())["items"] == ["Jane Smith", "John Doe"]
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        db_manager.close()